@@ -0,0 +1,139 @@
+import os
+import re
+import io
+import base64
+
+try:
+    from PIL import Image, ImageFilter, features
+except ImportError:  # Pillow is optional: without it dimensions are unknown (None)
+    Image = None
+
+# ---------------------- Configuration ----------------------
+POSTERS_DIR = 'images/posters'
+STILLS_DIR = 'images/stills'
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.avif', '.gif')
+# Low-quality image placeholder: a tiny blurred image shown (scaled up) until the image loads.
+# WebP keeps it around 60 bytes; PNG is the fallback when Pillow has no WebP encoder.
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 40
+
+
+# ---------------------- Helper Functions ----------------------
+
+def natural_key(filename):
+    """Sort key that orders 'home_2.jpg' before 'home_10.jpg'."""
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r'(\d+)', filename)]
+
+
+def _image_entries(folder):
+    """Returns the image DirEntry objects directly inside folder, in natural order."""
+    try:
+        with os.scandir(folder) as it:
+            entries = [e for e in it if e.is_file() and e.name.lower().endswith(IMAGE_EXTENSIONS)]
+    except FileNotFoundError:
+        return []
+    return sorted(entries, key=lambda e: natural_key(e.name))
+
+
+def image_preview(im):
+    """
+    Returns (dominant colour as '#rrggbb', placeholder data URI) for an open Pillow image.
+    JPEGs are decoded at reduced scale (draft mode), so this stays cheap for large stills.
+    """
+    im.draft('RGB', (PLACEHOLDER_WIDTH * 4, PLACEHOLDER_WIDTH * 4))
+    im = im.convert('RGB')
+    r, g, b = im.resize((1, 1), Image.BOX).getpixel((0, 0))
+    height = max(1, round(im.height * PLACEHOLDER_WIDTH / im.width))
+    tiny = im.resize((PLACEHOLDER_WIDTH, height), Image.BOX).filter(ImageFilter.GaussianBlur(1))
+    image_format = 'webp' if features.check('webp') else 'png'
+    buffer = io.BytesIO()
+    tiny.save(buffer, format=image_format.upper(), quality=PLACEHOLDER_QUALITY)
+    return (f"#{r:02x}{g:02x}{b:02x}",
+            f"data:image/{image_format};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}")
+
+
+def describe_image(entry, manifest=None):
+    """
+    Returns {'path', 'bytes', 'width', 'height', 'format', 'color', 'placeholder'} for an image DirEntry.
+    Dimensions come from the image header, colour and placeholder from a reduced decode (Pillow);
+    they are cached in the manifest's 'images' section under the file's size and mtime,
+    so unchanged files aren't reopened. Without Pillow they are None.
+    """
+    st = entry.stat()
+    path = entry.path.replace(os.sep, '/')
+    cache = manifest.setdefault('images', {}) if manifest is not None else {}
+    cached = cache.get(path)
+    if not (cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns
+            and 'placeholder' in cached):
+        width = height = color = placeholder = None
+        image_format = os.path.splitext(entry.name)[1].lstrip('.').upper().replace('JPG', 'JPEG')
+        if Image is not None:
+            try:
+                with Image.open(entry.path) as im:
+                    (width, height), image_format = im.size, im.format
+                    color, placeholder = image_preview(im)
+            except OSError:
+                pass
+        cached = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'width': width, 'height': height,
+                  'format': image_format, 'color': color, 'placeholder': placeholder}
+        cache[path] = cached
+    return {'path': path, 'bytes': cached['size'], 'width': cached['width'], 'height': cached['height'],
+            'format': cached['format'], 'color': cached['color'], 'placeholder': cached['placeholder']}
+
+
+def build_index(manifest=None):
+    """
+    Scans images/posters/<slug>/ and images/stills/<slug>/ once and returns
+    {slug: {'poster': image or None, 'stills': [image, ...]}} (see describe_image).
+    The poster is <slug>.<any image extension>, else the first image in its folder;
+    stills are every image in the stills folder, in natural order.
+    With a manifest, the header reads are cached and images that disappeared are dropped from it.
+    """
+    index = {}
+    described = set()
+    for kind, root in (('poster', POSTERS_DIR), ('stills', STILLS_DIR)):
+        try:
+            with os.scandir(root) as it:
+                folders = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+        except FileNotFoundError:
+            continue
+        for folder in folders:
+            images = [describe_image(e, manifest) for e in _image_entries(folder.path)]
+            described.update(im['path'] for im in images)
+            if not images:
+                continue
+            entry = index.setdefault(folder.name, {'poster': None, 'stills': []})
+            if kind == 'poster':
+                named = [im for im in images if os.path.splitext(os.path.basename(im['path']))[0] == folder.name]
+                entry['poster'] = (named or images)[0]
+            else:
+                entry['stills'] = images
+
+    if manifest is not None:
+        manifest['images'] = {path: info for path, info in manifest.get('images', {}).items() if path in described}
+    return index
+
+
+def image_info(image):
+    """The public (film JSON) view of an index image: site-relative src, dimensions and placeholder."""
+    return {'src': image['path'], 'width': image['width'], 'height': image['height'],
+            'color': image['color'], 'placeholder': image['placeholder']}
+
+
+def film_images(index, slug):
+    """Returns the 'Images' entry for a film record: {'Poster': info or None, 'Stills': [info, ...]}."""
+    entry = index.get(slug) or {'poster': None, 'stills': []}
+    return {
+        'Poster': image_info(entry['poster']) if entry['poster'] else None,
+        'Stills': [image_info(still) for still in entry['stills']],
+    }
+
+
+def iter_images(index):
+    """Yields (kind, image) for every poster ('posters') and still ('stills') in the index."""
+    for slug in sorted(index):
+        if index[slug]['poster']:
+            yield 'posters', index[slug]['poster']
+    for slug in sorted(index):
+        for image in index[slug]['stills']:
+            yield 'stills', image
@@ -0,0 +1,176 @@
+import io
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime, timezone
+
+import build_manifest
+import pipeline
+import precompress
+import synthetic_corpus
+
+# ---------------------- Configuration ----------------------
+# Scaling benchmark of the build: synthetic catalogues (synthetic_corpus.py) of several sizes
+# are built stage by stage from scratch, recording wall time (best of --repeat runs) and the
+# peak Python heap of every stage (a separate, tracemalloc-traced run; allocations in worker
+# processes of --jobs > 1 are not seen). Results are written as JSON, so runs can be diffed,
+# or compared directly with --baseline. Resizing and encoding the images takes most of the
+# time; --no-images benchmarks the other stages on large corpora in minutes.
+DEFAULT_SIZES = [20, 200, 2000]  # about 1x, 10x and 100x the real catalogue
+STAGES = ['extract', 'merge', 'images', 'indexes', 'render', 'compress']
+RESULTS_PATH = 'benchmark_results.json'
+# Scaling exponent above which a stage is reported as super-linear (time ~ films ** exponent)
+SUPERLINEAR_EXPONENT = 1.25
+# Stages faster than this at the smaller size are too noisy to judge their scaling
+MIN_SCALING_SECONDS = 0.05
+# Slowdown against a baseline run that is reported as a regression
+REGRESSION_RATIO = 1.2
+
+
+# ---------------------- Helper Functions ----------------------
+
+def run_build(corpus_dir, jobs=1, trace_memory=False):
+    """
+    Runs the build stages (as pipeline.build does) in corpus_dir with an empty manifest.
+    Returns {stage: {'seconds', 'peak_kb'}}; peak_kb is None unless trace_memory.
+    """
+    results = {}
+    manifest = build_manifest.empty_manifest()
+
+    def measure(stage, function):
+        if trace_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        value = function()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] // 1024 if trace_memory else None
+        results[stage] = {'seconds': round(seconds, 4), 'peak_kb': peak}
+        return value
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with contextlib.chdir(corpus_dir), contextlib.redirect_stdout(io.StringIO()):
+            records = measure('extract', lambda: pipeline.extract(manifest=manifest, jobs=jobs))
+            films = measure('merge', lambda: pipeline.merge(records))
+            index = measure('images', lambda: pipeline.images(manifest, jobs))
+            films = pipeline.with_image_info(films, index, manifest['derivatives'])
+            measure('indexes', lambda: pipeline.write_indexes(films))
+            measure('render', lambda: pipeline.render(films, manifest=manifest, index=index))
+            measure('compress', lambda: precompress.precompress(manifest, report=False))
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    if len(films) != len(records):
+        print(f"⚠️ {len(records)} questionnaire(s) extracted but {len(films)} film(s) merged")
+    return results
+
+
+def benchmark_size(films, work_dir, seed=0, repeat=3, jobs=1, images=True):
+    """Generates a corpus of films films and benchmarks it. Returns its result entry."""
+    corpus_dir = os.path.join(work_dir, f"corpus_{films}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        synthetic_corpus.generate_corpus(corpus_dir, films, seed, images=images)
+
+    runs = [run_build(corpus_dir, jobs) for _ in range(repeat)]
+    memory = run_build(corpus_dir, jobs, trace_memory=True)
+    stages = {stage: {'seconds': min(run[stage]['seconds'] for run in runs), 'peak_kb': memory[stage]['peak_kb']}
+              for stage in STAGES}
+    total = sum(stage['seconds'] for stage in stages.values())
+    print(f"{films:>6} films: {total:8.2f} s  "
+          + "  ".join(f"{stage} {stages[stage]['seconds']:.2f}s/{stages[stage]['peak_kb'] / 1024:.0f}MB"
+                      for stage in STAGES))
+    return {'films': films, 'total_seconds': round(total, 4), 'stages': stages}
+
+
+def scaling_exponents(runs):
+    """
+    For every stage, the largest exponent k between consecutive sizes such that
+    time grows like films ** k (1 = linear). None if no pair of sizes was slow enough to judge.
+    """
+    exponents = {}
+    for stage in STAGES:
+        values = []
+        for small, large in zip(runs, runs[1:]):
+            t_small, t_large = small['stages'][stage]['seconds'], large['stages'][stage]['seconds']
+            if t_small >= MIN_SCALING_SECONDS and large['films'] > small['films']:
+                values.append(math.log(t_large / t_small) / math.log(large['films'] / small['films']))
+        exponents[stage] = round(max(values), 3) if values else None
+    return exponents
+
+
+def compare_with_baseline(results, baseline):
+    """Prints the stages that got slower than in the baseline run (same corpus sizes only)."""
+    baseline_runs = {run['films']: run for run in baseline['runs']}
+    regressions = 0
+    for run in results['runs']:
+        old = baseline_runs.get(run['films'])
+        if not old:
+            continue
+        for stage in STAGES:
+            before, after = old['stages'][stage]['seconds'], run['stages'][stage]['seconds']
+            if before >= MIN_SCALING_SECONDS and after / before > REGRESSION_RATIO:
+                regressions += 1
+                print(f"⚠️ {stage} at {run['films']} films: {before:.2f}s -> {after:.2f}s ({after / before:.2f}x)")
+    if not regressions:
+        print("✅ No regressions against the baseline.")
+    return regressions
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, seed=0, repeat=3, jobs=1, work_dir=None, images=True):
+    """Benchmarks every corpus size and returns the results document."""
+    keep = work_dir is not None
+    work_dir = work_dir or tempfile.mkdtemp(prefix='cinefila_bench_')
+    try:
+        runs = [benchmark_size(films, work_dir, seed, repeat, jobs, images) for films in sorted(sizes)]
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'seed': seed,
+        'repeat': repeat,
+        'jobs': jobs,
+        'images': images,
+        'runs': runs,
+        'scaling': scaling_exponents(runs),
+    }
+
+
+# ---------------------- Main Logic ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the build on synthetic catalogues of several sizes.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="corpus sizes in films")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per size (the fastest is kept)")
+    parser.add_argument('--jobs', type=int, default=1, help="parallel processes for extraction and images")
+    parser.add_argument('--seed', type=int, default=0, help="random seed of the synthetic corpora")
+    parser.add_argument('--no-images', action='store_true', help="corpora without posters and stills")
+    parser.add_argument('--work-dir', help="keep the generated corpora in this folder (default: a temporary one)")
+    parser.add_argument('--output', default=RESULTS_PATH, help="where to write the JSON results")
+    parser.add_argument('--baseline', help="earlier results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.seed, args.repeat, args.jobs, args.work_dir, not args.no_images)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results saved as {args.output}")
+
+    superlinear = {stage: k for stage, k in results['scaling'].items() if k is not None and k > SUPERLINEAR_EXPONENT}
+    for stage, k in superlinear.items():
+        print(f"⚠️ {stage} scales super-linearly: time ~ films^{k}")
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_with_baseline(results, json.load(f))
+    sys.exit(1 if superlinear or regressions else 0)
@@ -0,0 +1,86 @@
+import os
+import json
+import hashlib
+
+# ---------------------- Configuration ----------------------
+MANIFEST_PATH = 'data/build_manifest.json'
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+
+
+# ---------------------- Helper Functions ----------------------
+
+def empty_manifest():
+    """Returns a fresh manifest with all sections present."""
+    return {
+        'version': MANIFEST_VERSION,
+        'files': {},           # path -> {'size', 'mtime_ns', 'sha256'}; stat cache for content hashes
+        'questionnaires': {},  # questionnaire filename -> {'sha256' of the file and the extractor, 'record'}
+        'pages': {},           # output page path -> combined hash of everything the page was rendered from
+        'images': {},          # image path -> {'size', 'mtime_ns', 'width', 'height', 'format'}; see asset_index
+        'derivatives': {},     # source image path -> {'sha256', 'size', 'variants'}; see image_derivatives
+        'optimized': {},       # image hash before -> after lossless optimisation; see image_optimizer
+        'compressed': {},      # served text file -> {'sha256', 'sizes'} of its .gz/.br siblings; see precompress
+    }
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """
+    Loads the build manifest. A missing, unreadable or outdated manifest
+    simply yields an empty one, which turns the next build into a full build.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return empty_manifest()
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        return empty_manifest()
+    for section, default in empty_manifest().items():
+        manifest.setdefault(section, default)
+    return manifest
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Writes the manifest atomically so an interrupted build never leaves a truncated file."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)  # no sort_keys: cached records keep field order
+    os.replace(tmp_path, path)
+
+
+def file_digest(manifest, path):
+    """
+    Returns the SHA-256 of a file's content, or None if the file does not exist.
+    The hash is cached in the manifest under the file's size and mtime, so
+    unchanged files (e.g. multi-megabyte stills) are only stat'ed, never re-read.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        manifest['files'].pop(path, None)
+        return None
+
+    cached = manifest['files'].get(path)
+    if cached and cached['size'] == st.st_size and cached['mtime_ns'] == st.st_mtime_ns:
+        return cached['sha256']
+
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(chunk)
+    digest = h.hexdigest()
+    manifest['files'][path] = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest}
+    return digest
+
+
+def data_digest(data):
+    """Returns a stable SHA-256 of any JSON-serialisable value."""
+    payload = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def combine_digests(*digests):
+    """Combines several digests (None meaning 'missing') into one."""
+    return data_digest([d or '' for d in digests])
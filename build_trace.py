@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import tracemalloc
+import contextlib
+from datetime import datetime, timezone
+
+# ---------------------- Configuration ----------------------
+# Build instrumentation. pipeline.build() starts a trace; the stages and the per-item work
+# inside them (one questionnaire extracted, one page rendered) are recorded as spans with wall
+# and CPU time, the files they read and wrote, and, with trace_memory, the tracemalloc peak.
+# The result is a machine-readable report (data/build_report.json) and, optionally, a
+# Chrome trace (chrome://tracing, https://ui.perfetto.dev). Without an active trace every
+# call here is a no-op, so the scripts run standalone exactly as before.
+REPORT_PATH = 'data/build_report.json'
+COUNTERS = ['files_read', 'bytes_read', 'files_written', 'bytes_written']
+SLOWEST_ITEMS = 10  # per category, in the report summary
+
+_trace = None  # the active trace, see start_trace()
+
+
+# ---------------------- Helper Functions ----------------------
+
+def now_us():
+    """Trace timestamp in microseconds. perf_counter is system-wide on Linux/macOS, so worker timestamps line up."""
+    return time.perf_counter_ns() // 1000
+
+
+def start_trace(trace_memory=False):
+    """Starts recording; replaces any trace in progress."""
+    global _trace
+    _trace = {
+        'started': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'pid': os.getpid(),
+        'trace_memory': trace_memory,
+        'start_us': now_us(),
+        'start_cpu': time.process_time(),
+        'stages': [],
+        'events': [],
+        'counters': dict.fromkeys(COUNTERS, 0),
+    }
+    if trace_memory:
+        tracemalloc.start()
+
+
+def count(name, n=1):
+    """Adds n to a counter of the current stage."""
+    if _trace is not None:
+        _trace['counters'][name] = _trace['counters'].get(name, 0) + n
+
+
+def file_read(path):
+    """Counts a file read by the build."""
+    if _trace is not None:
+        count('files_read')
+        count('bytes_read', os.path.getsize(path))
+
+
+def file_written(path):
+    """Counts a file written by the build."""
+    if _trace is not None:
+        count('files_written')
+        count('bytes_written', os.path.getsize(path))
+
+
+@contextlib.contextmanager
+def stage(name):
+    """Records a build stage: wall and CPU time, counter deltas and (with trace_memory) the heap peak."""
+    if _trace is None:
+        yield
+        return
+    counters_before = dict(_trace['counters'])
+    if _trace['trace_memory']:
+        tracemalloc.reset_peak()
+    start_us, start_cpu = now_us(), time.process_time()
+    try:
+        yield
+    finally:
+        wall_us = now_us() - start_us
+        entry = {
+            'name': name,
+            'wall_seconds': round(wall_us / 1e6, 4),
+            'cpu_seconds': round(time.process_time() - start_cpu, 4),
+            'peak_kb': tracemalloc.get_traced_memory()[1] // 1024 if _trace['trace_memory'] else None,
+            **{key: value - counters_before.get(key, 0) for key, value in _trace['counters'].items()},
+        }
+        _trace['stages'].append(entry)
+        add_event(name, 'stage', start_us, wall_us, args={k: v for k, v in entry.items() if k != 'name'})
+
+
+@contextlib.contextmanager
+def span(name, category, **args):
+    """Records one item of work (e.g. the page of one film) inside the current stage."""
+    if _trace is None:
+        yield
+        return
+    start_us = now_us()
+    try:
+        yield
+    finally:
+        add_event(name, category, start_us, now_us() - start_us, args=args)
+
+
+def add_event(name, category, start_us, duration_us, tid=None, args=None):
+    """Adds a complete event; work measured in a worker process passes its pid as tid."""
+    if _trace is not None:
+        _trace['events'].append({'name': name, 'cat': category, 'ph': 'X', 'ts': start_us, 'dur': duration_us,
+                                 'pid': _trace['pid'], 'tid': tid or _trace['pid'], 'args': args or {}})
+
+
+def timed_call(function, *args):
+    """
+    Runs function(*args) and returns (result, start_us, duration_us, pid).
+    Module-level, so process pool workers can time their own work for add_event().
+    """
+    start_us = now_us()
+    result = function(*args)
+    return result, start_us, now_us() - start_us, os.getpid()
+
+
+def build_report():
+    """The report of the trace so far: totals, stages, counters and the slowest items per category."""
+    items = {}
+    for event in _trace['events']:
+        if event['cat'] != 'stage':
+            items.setdefault(event['cat'], []).append(
+                {'name': event['name'], 'seconds': round(event['dur'] / 1e6, 4), **event['args']})
+    return {
+        'started': _trace['started'],
+        'wall_seconds': round((now_us() - _trace['start_us']) / 1e6, 4),
+        'cpu_seconds': round(time.process_time() - _trace['start_cpu'], 4),
+        'trace_memory': _trace['trace_memory'],
+        'counters': _trace['counters'],
+        'stages': _trace['stages'],
+        'slowest': {category: sorted(entries, key=lambda e: e['seconds'], reverse=True)[:SLOWEST_ITEMS]
+                    for category, entries in items.items()},
+        'items': items,
+    }
+
+
+def finish_trace(report_path=REPORT_PATH, chrome_trace_path=None):
+    """Stops recording, writes the build report (and the Chrome trace) and prints a stage summary."""
+    global _trace
+    if _trace is None:
+        return None
+    if _trace['trace_memory']:
+        tracemalloc.stop()
+    report = build_report()
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+    if chrome_trace_path:
+        with open(chrome_trace_path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': _trace['events'], 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    _trace = None
+
+    for entry in report['stages']:
+        memory = f", peak {entry['peak_kb'] / 1024:.1f} MB" if entry['peak_kb'] is not None else ""
+        print(f"  {entry['name']:<10} {entry['wall_seconds']:8.3f} s wall {entry['cpu_seconds']:8.3f} s CPU{memory}, "
+              f"{entry['files_written']} file(s) / {entry['bytes_written'] // 1024} KB written")
+    print(f"✅ Build report saved as {report_path}"
+          f"{f', Chrome trace as {chrome_trace_path}' if chrome_trace_path else ''} "
+          f"({report['wall_seconds']:.2f} s)")
+    return report
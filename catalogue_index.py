@@ -0,0 +1,102 @@
+import os
+import re
+import json
+import math
+
+import build_trace
+import generate_pages
+
+# ---------------------- Configuration ----------------------
+# Slim, minified film list for the catalogue, the top-films section and the search overlay
+# (js/script.js, js/loadPartials.js). Only the fields those views use are kept, and the
+# values the browser used to derive (ranking, year, runtime) are pre-parsed here.
+CATALOGUE_PATH = 'data/catalogue.json'
+FILM_PAGES_DIR = 'film_pages'
+# Runtime categories of the catalogue's length filter: (upper bound in minutes, name)
+LENGTH_CATEGORIES = [(39, 'short'), (70, 'mid-length'), (math.inf, 'full-length')]
+
+
+# ---------------------- Helper Functions ----------------------
+
+def parse_ranking(value):
+    """Leading integer of the Ranking field (like JS parseInt), or None."""
+    match = re.match(r'\s*([+-]?\d+)', str(value)) if value is not None else None
+    return int(match.group(1)) if match else None
+
+
+def parse_year(date_of_completion):
+    """First standalone four-digit number of Date_of_completion, or None."""
+    match = re.search(r'\b\d{4}\b', date_of_completion or '', re.ASCII)
+    return int(match.group(0)) if match else None
+
+
+def parse_runtime_minutes(runtime):
+    """
+    Runtime in whole minutes, or None: 'hh:mm:ss', 'mm:ss' or plain minutes,
+    rounded half up (the rules the catalogue used in the browser).
+    """
+    if not runtime or not isinstance(runtime, str):
+        return None
+    clean = re.sub(r'[^0-9:]', '', runtime.strip())
+    parts = [int(p) if p else 0 for p in clean.split(':')]
+    if len(parts) == 3:
+        minutes = parts[0] * 60 + parts[1] + parts[2] / 60
+    elif len(parts) == 2:
+        minutes = parts[0] + parts[1] / 60
+    elif len(parts) == 1 and clean:
+        minutes = parts[0]
+    else:
+        return None
+    return math.floor(minutes + 0.5)
+
+
+def length_category(minutes):
+    """'short', 'mid-length' or 'full-length' for a runtime in minutes (None stays None)."""
+    if minutes is None:
+        return None
+    return next(name for limit, name in LENGTH_CATEGORIES if minutes <= limit)
+
+
+def split_keywords(keywords):
+    """Comma separated Keywords field -> list of trimmed, non-empty keywords."""
+    return [k.strip() for k in (keywords or '').split(',') if k.strip()]
+
+
+def catalogue_entry(film_id, film):
+    """Shapes one merged film record into its catalogue entry."""
+    fdata = film.get("Film", {})
+    target_group = fdata.get("Target_Group", {})
+    minutes = parse_runtime_minutes(fdata.get("Runtime"))
+    stills = film.get("Images", {}).get("Stills", [])
+    return {
+        'id': film_id,
+        'page': f"{FILM_PAGES_DIR}/{generate_pages.film_page_slug(film)}.html",
+        'title': (fdata.get("Title_English") or fdata.get("Title_Original") or 'Untitled').strip(),
+        'title_original': fdata.get("Title_Original", ""),
+        'director': (film.get("Crew", {}).get("Director(s)") or "").strip(),
+        'logline': (film.get("Logline") or "").strip(),
+        'ranking': parse_ranking(film.get("Ranking")),
+        'genres': [g.strip() for g in fdata.get("Genre_List", []) if g and g.strip()],
+        'year': parse_year(fdata.get("Date_of_completion")),
+        'minutes': minutes,
+        'length': length_category(minutes),
+        'country': (fdata.get("Country_of_production") or "").strip(),
+        'rating': (target_group.get("Rating") or "").strip(),
+        'audience': (target_group.get("Audience") or "").strip(),
+        'keywords': split_keywords(fdata.get("Keywords")),
+        'still': stills[0] if stills else None,
+    }
+
+
+def build_catalogue(films):
+    """Returns the catalogue entries of the merged films; an entry's id is its position."""
+    return [catalogue_entry(film_id, film) for film_id, film in enumerate(films)]
+
+
+def save_catalogue(entries, path=CATALOGUE_PATH):
+    """Writes the catalogue as minified JSON."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, separators=(',', ':'))
+    build_trace.file_written(path)
+    print(f"✅ Catalogue index saved as {path} ({os.path.getsize(path) // 1024} KB)")
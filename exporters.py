@@ -0,0 +1,121 @@
+import os
+import csv
+
+import build_trace
+import questionare_schema
+
+# ---------------------- Configuration ----------------------
+# Spreadsheet exports of the extracted questionnaires, one flat row per questionnaire with
+# the nested fields as dotted columns (Film.Title_English, ...) in questionnaire schema order.
+# Exporters are chosen per run (run.py --export) and only import what they need:
+#   xlsx     openpyxl in write-only (streaming) mode
+#   csv      standard library only (UTF-8 with BOM, so Excel detects the encoding)
+#   parquet  pandas with pyarrow (or fastparquet)
+# Lists (festivals, genres, cast, ...) are written as their Python repr, as the sheet always had them.
+EXPORT_FORMATS = ['xlsx', 'csv', 'parquet']
+DEFAULT_EXPORTS = ['xlsx']
+EXPORT_BASENAME = 'all_html_data'
+SHEET_NAME = 'Sheet1'
+
+
+# ---------------------- Helper Functions ----------------------
+
+def flatten(record, prefix=''):
+    """Nested dicts -> one dict with dotted keys (like pandas.json_normalize), in field order."""
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def table_columns(records):
+    """The schema's columns that occur, then any others (Source_File, extra address lines) in order of appearance."""
+    seen = {}
+    for record in records:
+        seen.update(dict.fromkeys(flatten(record)))
+    schema_columns = [c for c in questionare_schema.EXCEL_COLUMNS if c in seen]
+    return schema_columns + [c for c in seen if c not in set(schema_columns)]
+
+
+def cell(value):
+    """A value as a spreadsheet cell: lists as their repr, empty strings as empty cells."""
+    if isinstance(value, list):
+        return str(value)
+    return None if value == '' else value
+
+
+def iter_rows(records, columns):
+    """Flattens the records one at a time, so no second copy of the data is ever built."""
+    for record in records:
+        flat = flatten(record)
+        yield [cell(flat.get(column)) for column in columns]
+
+
+def export_xlsx(records, columns, path):
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+    except ImportError:
+        print("Warning: 'openpyxl' is not installed. Excel file will not be created. "
+              "Please install it using 'pip install openpyxl'.")
+        return False
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(SHEET_NAME)
+    header = []
+    for column in columns:
+        header_cell = WriteOnlyCell(sheet, value=column)
+        header_cell.font = Font(bold=True)
+        header.append(header_cell)
+    sheet.append(header)
+    for row in iter_rows(records, columns):
+        sheet.append(row)
+    workbook.save(path)
+    return True
+
+
+def export_csv(records, columns, path):
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        writer.writerows(iter_rows(records, columns))
+    return True
+
+
+def export_parquet(records, columns, path):
+    try:
+        import pandas as pd
+        pd.DataFrame(iter_rows(records, columns), columns=columns).to_parquet(path, index=False)
+    except ImportError:
+        print("Warning: Parquet export needs pandas and pyarrow. Parquet file will not be created. "
+              "Please install them using 'pip install pandas pyarrow'.")
+        return False
+    return True
+
+
+EXPORTERS = {'xlsx': export_xlsx, 'csv': export_csv, 'parquet': export_parquet}
+
+
+def export_path(output_dir, export_format, basename=EXPORT_BASENAME):
+    return os.path.join(output_dir, f"{basename}.{export_format}")
+
+
+def export_records(records, output_dir, formats=DEFAULT_EXPORTS, basename=EXPORT_BASENAME):
+    """Writes the extracted records in each of the given formats. Returns the paths written."""
+    if not formats:
+        return []
+    columns = table_columns(records)
+    written = []
+    for export_format in formats:
+        path = export_path(output_dir, export_format, basename)
+        try:
+            if EXPORTERS[export_format](records, columns, path):
+                build_trace.file_written(path)
+                written.append(path)
+                print(f"All data successfully saved to {path}")
+        except Exception as e:
+            print(f"Error saving {export_format} file {path}: {e}")
+    return written
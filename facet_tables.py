@@ -0,0 +1,70 @@
+import os
+import json
+
+import build_trace
+
+# ---------------------- Configuration ----------------------
+# Filter facets of the catalogue page (js/script.js): for every facet, its distinct values
+# in display order and, per value, the sorted ids of the films that have it. The browser
+# filters by intersecting these id lists and counts options without scanning the films.
+FACETS_PATH = 'data/facets.json'
+LENGTH_ORDER = ['short', 'mid-length', 'full-length']
+# facet name -> catalogue entry field (a value or a list of values)
+FACET_FIELDS = {
+    'genre': 'genres',
+    'year': 'year',
+    'length': 'length',
+    'country': 'country',
+    'rating': 'rating',
+    'audience': 'audience',
+    'keywords': 'keywords',
+}
+
+
+# ---------------------- Helper Functions ----------------------
+
+def facet_values(entry, field):
+    """The non-empty values of one catalogue entry field, as strings."""
+    value = entry.get(field)
+    values = value if isinstance(value, list) else [value]
+    return [str(v) for v in values if v not in (None, '')]
+
+
+def sort_values(facet, values):
+    """Display order of a facet's values, as the catalogue always showed them."""
+    if facet == 'year':
+        return sorted(values, key=int, reverse=True)
+    if facet == 'length':
+        return [v for v in LENGTH_ORDER if v in values]
+    return sorted(values, key=lambda v: v.encode('utf-16-be'))  # JS default sort order
+
+
+def build_facet(entries, field, facet):
+    """
+    Returns {'values': [...], 'ids': [[film id, ...], ...]} for one facet.
+    Values are matched case-insensitively; the first spelling seen is displayed.
+    """
+    display = {}
+    ids = {}
+    for entry in entries:
+        for value in facet_values(entry, field):
+            key = value.lower()
+            display.setdefault(key, value)
+            if entry['id'] not in ids.setdefault(key, []):
+                ids[key].append(entry['id'])
+    values = sort_values(facet, list(display.values()))
+    return {'values': values, 'ids': [sorted(ids[v.lower()]) for v in values]}
+
+
+def build_facets(entries):
+    """Builds every facet table from the catalogue entries (catalogue_index.build_catalogue)."""
+    return {facet: build_facet(entries, field, facet) for facet, field in FACET_FIELDS.items()}
+
+
+def save_facets(facets, path=FACETS_PATH):
+    """Writes the facet tables as minified JSON."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(facets, f, ensure_ascii=False, separators=(',', ':'))
+    build_trace.file_written(path)
+    print(f"✅ Facet tables saved as {path} ({sum(len(f['values']) for f in facets.values())} values)")
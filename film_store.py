@@ -0,0 +1,115 @@
+import os
+import json
+
+import build_manifest
+
+# ---------------------- Configuration ----------------------
+# Optional JSON-Lines store for film records: one film per line, keyed by Source_File.
+# The file is an append-only log. Updating or deleting a film appends one line
+# (a new version, or a tombstone) instead of rewriting every record; readers keep
+# the latest version of each film. compact() rewrites the log once it holds more
+# stale lines than live ones.
+# The store is written by questionare_info.py --store jsonl (raw records) and by
+# run.py --store jsonl (merged records); join_data.py and generate_pages.py --store jsonl
+# stream from it. The one-process build (pipeline.py) keeps its records in memory and
+# only syncs the store, so the standalone scripts can take over from there.
+JSONL_PATH = 'data/all_html_data.jsonl'
+DELETED_FLAG = '_deleted'
+
+
+# ---------------------- Helper Functions ----------------------
+
+def record_key(record):
+    """The store key of a film record."""
+    return record.get('Source_File')
+
+
+def _iter_lines(path):
+    """Yields (line number, parsed object) for every non-empty line of the store."""
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        return
+    with f:
+        for line_number, line in enumerate(f):
+            if line.strip():
+                yield line_number, json.loads(line)
+
+
+def _latest_lines(path):
+    """Returns {key: line number of its latest version} without keeping any record in memory."""
+    latest = {}
+    for line_number, record in _iter_lines(path):
+        latest[record_key(record)] = line_number
+    return latest
+
+
+def iter_records(path=JSONL_PATH):
+    """
+    Streams the live film records, one at a time, in the order they were last written.
+    Memory use is one record plus one line number per film, whatever the store size.
+    """
+    latest = _latest_lines(path)
+    for line_number, record in _iter_lines(path):
+        if latest.get(record_key(record)) == line_number and not record.get(DELETED_FLAG):
+            yield record
+
+
+def _append_lines(path, records):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+
+def write_records(records, path=JSONL_PATH):
+    """Replaces the whole store with the given records (streamed through a temporary file)."""
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    _append_lines(tmp_path, records)
+    os.replace(tmp_path, path)
+
+
+def upsert_records(records, path=JSONL_PATH):
+    """
+    Appends a new version of every record whose content differs from the stored one.
+    Unchanged films are not touched. Returns the number of lines appended.
+    """
+    stored_digests = {record_key(record): build_manifest.data_digest(record)
+                      for record in iter_records(path)}
+    changed = [record for record in records
+               if stored_digests.get(record_key(record)) != build_manifest.data_digest(record)]
+    _append_lines(path, changed)
+    return len(changed)
+
+
+def delete_records(keys, path=JSONL_PATH):
+    """Appends a tombstone for each key. Returns the number of lines appended."""
+    keys = list(keys)
+    _append_lines(path, [{'Source_File': key, DELETED_FLAG: True} for key in keys])
+    return len(keys)
+
+
+def sync_records(records, path=JSONL_PATH):
+    """
+    Makes the store hold exactly the given records, touching only the lines of
+    films that were added, changed or removed. Compacts the log when it has grown
+    to more stale lines than live ones. Returns (appended, deleted).
+    """
+    records = list(records)
+    wanted_keys = {record_key(record) for record in records}
+    removed_keys = [key for key in {record_key(record) for record in iter_records(path)} - wanted_keys]
+    appended = upsert_records(records, path)
+    deleted = delete_records(removed_keys, path)
+
+    line_count = sum(1 for _ in _iter_lines(path))
+    if line_count > 2 * len(wanted_keys):
+        compact(path)
+    return appended, deleted
+
+
+def compact(path=JSONL_PATH):
+    """Rewrites the store with only the latest version of each live film."""
+    write_records(iter_records(path), path)
+
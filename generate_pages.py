@@ -1,465 +1,31 @@
 import os
+import sys
+import argparse
 import json
 import re
+import build_manifest
+import build_trace
+import asset_index
+import film_store
+import image_derivatives
+import page_templates
+import static_assets
 
 # ---------------------- Configuration ----------------------
 JSON_PATH = 'data/all_html_data.json'
 OUTPUT_DIR = 'film_pages'
 INDEX_FILE = 'index.html'
 POSTER_DIR = '../images/posters'
-STILLS_DIR = '../images/stills'
-
-# ---------------------- Templates ----------------------
-FILM_TEMPLATE = """<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8" />
-  <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-  <title>{title_english}</title>
-  <style>
-    body {{
-      background-color: #2b2b2b;
-      color: white;
-      font-family: Arial, sans-serif;
-      padding: 20px;
-      line-height: 1.6;
-      max-width: 1200px;
-      margin: 0 auto;
-      padding-top: 20px;
-      padding-bottom: 50px;
-    }}
-    h1 {{
-      font-size: 2.5em;
-      margin-bottom: 0.1em;
-    }}
-    h2 {{
-      font-size: 1.8em;
-      margin-bottom: 0.5em;
-    }}
-    h3 {{
-      font-size: 1.4em;
-      margin-top: 25px;
-      margin-bottom: 5px;
-    }}
-    .logo-container {{
-      text-align: center;
-      margin-bottom: 30px;
-    }}
-    .logo-container img {{
-      max-width: 200px;
-      height: auto;
-    }}
-    .subtitle {{
-      font-style: italic;
-      margin-bottom: 10px;
-    }}
-    .horizontal-line {{
-      border-bottom: 1px solid white;
-      margin-top: 10px;
-      margin-bottom: 20px;
-    }}
-    .info-line {{
-      margin-bottom: 20px;
-      font-weight: bold;
-    }}
-    .top-section {{
-      display: flex;
-      gap: 40px;
-      flex-wrap: wrap;
-      justify-content: center;
-    }}
-    .poster-column {{
-      flex: 0 0 250px;
-      max-width: 250px;
-      /* Adjust width for better alignment if needed, e.g., if poster and still are different aspect ratios */
-    }}
-    .info-column {{
-      flex: 1;
-      min-width: 300px;
-    }}
-    .poster-column img.film-poster,
-    .poster-column img.main-film-still {{ /* Apply similar styling to the main still */
-      max-width: 100%;
-      height: auto;
-      border: 2px solid white;
-      display: block;
-      margin-bottom: 10px;
-      cursor: pointer; /* Make both clickable */
-    }}
-    .block {{
-      margin-bottom: 20px;
-    }}
-    .label {{
-      font-weight: bold;
-      margin-top: 10px;
-    }}
-    .flex-row {{
-      display: flex;
-      gap: 40px;
-      flex-wrap: wrap;
-      justify-content: center;
-    }}
-    .half {{
-      flex: 1;
-      min-width: 300px;
-    }}
-    .aligned-section {{
-      margin-left: calc(250px + 40px);
-      margin-right: 20px;
-      margin-bottom: 20px;
-    }}
-    a {{
-      color: white;
-    }}
-
-    /* Video Responsiveness */
-    .video-container {{
-      position: relative;
-      padding-bottom: 56.25%; /* 16:9 aspect ratio */
-      height: 0;
-      overflow: hidden;
-      max-width: 100%;
-      background: #000;
-      margin-top: 20px;
-    }}
-    .video-container iframe,
-    .video-container object,
-    .video-container embed {{
-      position: absolute;
-      top: 0;
-      left: 0;
-      width: 100%;
-      height: 100%;
-    }}
-
-    /* Stills Gallery (now for hidden thumbnails for lightbox data) */
-    .stills-gallery {{
-        display: none; /* Hide the entire gallery div as only the first still is displayed prominently */
-    }}
-    /* The individual img tags within stills-gallery are still needed for the lightbox JS data-stills attribute */
-
-
-    /* Lightbox Styles (General for stills, poster) */
-    .lightbox {{
-      display: none; /* Hidden by default */
-      position: fixed; /* Stay in place */
-      z-index: 1000; /* Sit on top */
-      left: 0;
-      top: 0;
-      width: 100%; /* Full width */
-      height: 100%; /* Full height */
-      overflow: auto; /* Enable scroll if needed */
-      background-color: rgba(0,0,0,0.9); /* Black w/ opacity */
-      align-items: center;
-      justify-content: center;
-    }}
-
-    .lightbox-content {{
-      position: relative;
-      margin: auto;
-      display: block;
-      max-width: 90%;
-      max-height: 90%;
-    }}
-
-    .lightbox-content img {{
-      width: 100%;
-      height: 100%;
-      object-fit: contain; /* Ensure the image fits within the bounds without cropping */
-    }}
-
-    .close-btn, .prev-btn, .next-btn {{
-      position: absolute;
-      color: #fff;
-      font-size: 40px;
-      font-weight: bold;
-      cursor: pointer;
-      user-select: none;
-      text-shadow: 0 0 5px black;
-    }}
-
-    .close-btn {{
-      top: 15px;
-      right: 35px;
-    }}
-
-    .prev-btn {{
-      top: 50%;
-      left: 35px;
-      transform: translateY(-50%);
-    }}
-
-    .next-btn {{
-      top: 50%;
-      right: 35px;
-      transform: translateY(-50%);
-    }}
-
-    .close-btn:hover,
-    .prev-btn:hover,
-    .next-btn:hover {{
-      color: #bbb;
-    }}
-
-
-    /* Media Queries for Responsiveness (kept for overall layout) */
-    @media (max-width: 768px) {{
-      body {{
-        padding: 15px;
-      }}
-      h1 {{
-        font-size: 2em;
-      }}
-      h2 {{
-        font-size: 1.5em;
-      }}
-      h3 {{
-        font-size: 1.2em;
-      }}
-      .logo-container img {{
-        max-width: 150px;
-      }}
-      .top-section {{
-        flex-direction: column;
-        align-items: center;
-        gap: 20px;
-      }}
-      .poster-column {{
-        flex: none;
-        width: 80%;
-        max-width: 250px; /* Keep consistent with desktop max-width for column */
-      }}
-      .info-column {{
-        min-width: unset;
-        width: 100%;
-      }}
-      .flex-row {{
-        flex-direction: column;
-        align-items: center;
-        gap: 20px;
-      }}
-      .half {{
-        min-width: unset;
-        width: 100%;
-      }}
-      .aligned-section {{
-        margin-left: 0;
-        margin-right: 0;
-        padding: 0 15px;
-      }}
-    }}
-
-    @media (max-width: 480px) {{
-      body {{
-        padding: 10px;
-      }}
-      h1 {{
-        font-size: 1.8em;
-      }}
-      h2 {{
-        font-size: 1.3em;
-      }}
-      h3 {{
-        font-size: 1.1em;
-      }}
-      .logo-container img {{
-        max-width: 120px;
-      }}
-      .poster-column {{
-        width: 90%;
-      }}
-      .aligned-section {{
-        padding: 0 10px;
-      }}
-    }}
-  </style>
-</head>
-<body>
-  <div class="logo-container">
-    <a href="../index.html">
-      <img src="../images/logo/Cinefila_logo_white_web.svg" alt="OFC Cinefila Logo" />
-    </a>
-  </div>
-
-
-  <h1>{title_english}</h1>
-  <div class="subtitle">Original Title: {title_original}</div>
-  <div class="horizontal-line"></div>
-
-  <div class="info-line">{genre} | {year} | {duration} minutes | {language} with {subtitles} subtitles | {country}</div>
-
-  <div class="top-section">
-    <div class="poster-column">
-      <div>
-        <img src="{poster_image}" alt="Poster" class="film-poster" id="poster-img"/>
-        <div class="label">Still</div>
-        {main_still_html}
-        {trailer_html}
-        <div class="label">Poster</div>
-        <div><a href="{poster_image}" target="_blank">Link to poster (opens in new tab)</a></div>
-      </div>
-    </div>
+# Shared page assets, published with fingerprinted names into the site's css/ and js/ folders
+CSS_DIR = '../css'
+JS_DIR = '../js'
+# srcset sizes: posters and the main still sit in the 250px poster column
+POSTER_SIZES = '250px'
+STILL_SIZES = '250px'
 
-    <div class="info-column">
-      {logline_html}
-      {synopsis_html}
-      {note_html}
-      {target_html}
-      {topics_html}
-    </div>
-  </div>
-
-  <div class="aligned-section"> <h3>Festival, Crew, Cast & Technical Info</h3>
-    <div class="flex-row">
-      <div class="half">
-        <div class="label">Festivals</div>
-        {festivals_html}
-        <div class="label">Awards</div>
-        {awards_html}
-        <div class="label">Sales Status</div>
-        {status}
-        <div class="label">Downloads</div>
-        {downloads}
-      </div>
-      <div class="half">
-        <div class="label">Crew</div>
-        {crew_html}
-        <div class="label">Cast</div>
-        {cast_html}
-      </div>
-    </div>
-    <div class="label">Technical Specs</div>
-    {technical_html}
-  </div>
-
-  {stills_gallery_for_lightbox_data}
-
-  <div id="lightbox" class="lightbox">
-    <span class="close-btn">&times;</span>
-    <img class="lightbox-content" id="lightbox-img" src="" alt="Still Image">
-    <span class="prev-btn">&#10094;</span>
-    <span class="next-btn">&#10095;</span>
-  </div>
-
-  <div id="poster-lightbox" class="lightbox">
-    <span class="close-btn">&times;</span>
-    <img class="lightbox-content" id="poster-lightbox-img" src="" alt="Film Poster">
-  </div>
-
-  <script>
-    document.addEventListener('DOMContentLoaded', function() {{
-      // Stills Lightbox
-      const stillsLightbox = document.getElementById('lightbox');
-      const stillsLightboxImg = document.getElementById('lightbox-img');
-      const stillsCloseBtn = stillsLightbox.querySelector('.close-btn');
-      const stillsPrevBtn = stillsLightbox.querySelector('.prev-btn');
-      const stillsNextBtn = stillsLightbox.querySelector('.next-btn');
-
-      let currentStillIndex = 0;
-      let currentStills = [];
-
-      // TARGET THE MAIN STILL IMAGE FOR CLICK EVENT
-      const mainFilmStill = document.getElementById('main-film-still');
-      if (mainFilmStill) {{
-        // Initialize currentStills from the data-stills attribute of the main still
-        currentStills = JSON.parse(mainFilmStill.dataset.stills);
-        mainFilmStill.addEventListener('click', function() {{
-          const clickedStill = this.getAttribute('src');
-          currentStillIndex = currentStills.indexOf(clickedStill); // Should be 0 for the first still
-          showStill(currentStillIndex);
-          stillsLightbox.style.display = 'flex';
-        }});
-      }}
-
-      // Fallback/alternative for if main still isn't present but other stills exist
-      // This is less likely if main_still_html is always generated from all_stills[0]
-      document.querySelectorAll('.stills-gallery img').forEach(img => {{
-        img.addEventListener('click', function() {{
-          currentStills = JSON.parse(this.dataset.stills);
-          const clickedStill = this.getAttribute('src');
-          currentStillIndex = currentStills.indexOf(clickedStill);
-          showStill(currentStillIndex);
-          stillsLightbox.style.display = 'flex';
-        }});
-      }});
-
-
-      stillsCloseBtn.addEventListener('click', function() {{
-        stillsLightbox.style.display = 'none';
-      }});
-
-      stillsLightbox.addEventListener('click', function(e) {{
-        if (e.target === stillsLightbox) {{
-          stillsLightbox.style.display = 'none';
-        }}
-      }});
-
-      stillsPrevBtn.addEventListener('click', function() {{
-        currentStillIndex = (currentStillIndex - 1 + currentStills.length) % currentStills.length;
-        showStill(currentStillIndex);
-      }});
-
-      stillsNextBtn.addEventListener('click', function() {{
-        currentStillIndex = (currentStillIndex + 1) % currentStills.length;
-        showStill(currentStillIndex);
-      }});
-
-      function showStill(index) {{
-        if (currentStills.length > 0) {{
-          stillsLightboxImg.src = currentStills[index];
-        }}
-      }}
-
-      // Poster Lightbox
-      const posterLightbox = document.getElementById('poster-lightbox');
-      const posterLightboxImg = document.getElementById('poster-lightbox-img');
-      const posterCloseBtn = posterLightbox.querySelector('.close-btn');
-      const filmPoster = document.getElementById('poster-img');
-
-      if (filmPoster) {{
-        filmPoster.addEventListener('click', function() {{
-          posterLightboxImg.src = this.src;
-          posterLightbox.style.display = 'flex';
-        }});
-      }}
-
-      posterCloseBtn.addEventListener('click', function() {{
-        posterLightbox.style.display = 'none';
-      }});
-
-      posterLightbox.addEventListener('click', function(e) {{
-        if (e.target === posterLightbox) {{
-          posterLightbox.style.display = 'none';
-        }}
-      }});
-
-      // Global Keydown for closing any lightbox
-      document.addEventListener('keydown', function(e) {{
-        if (e.key === 'Escape') {{
-          if (stillsLightbox.style.display === 'flex') {{
-            stillsCloseBtn.click();
-          }}
-          if (posterLightbox.style.display === 'flex') {{
-            posterCloseBtn.click();
-          }}
-        }}
-      }});
-
-      // Centralized Click-to-Close (for both stills and poster lightboxes)
-      const allLightboxes = [stillsLightbox, posterLightbox];
-      allLightboxes.forEach(lb => {{
-          lb.addEventListener('click', function(e) {{
-              // Check if the click is directly on the lightbox background
-              if (e.target === lb) {{
-                  lb.style.display = 'none';
-              }}
-          }});
-      }});
-    }});
-  </script>
-</body>
-</html>
-"""
+FILM_TEMPLATE = 'film_page.html'  # in templates/, see page_templates.py
+FILM_STYLESHEET = 'film_page.css'
+FILM_SCRIPT = 'film_page.js'
 
 
 # ---------------------- Helper Functions ----------------------
@@ -478,11 +44,7 @@ def list_block(title, items):
     """Generates an HTML unordered list with a title, if items exist."""
     if not items:
         return ""
-    html = f"<h3>{title}</h3><ul>"
-    for item in items:
-        html += f"<li>{item}</li>"
-    html += "</ul>"
-    return html
+    return "".join([f"<h3>{title}</h3><ul>", *[f"<li>{item}</li>" for item in items], "</ul>"])
 
 
 def build_crew(crew):
@@ -535,44 +97,104 @@ def build_trailer_embed(trailer_url):
     """
 
 
-def get_film_stills(film_sanitized_title):
+def get_film_stills(film_sanitized_title, index):
     """
-    Gets relative paths to film still images for a given film.
-    Checks for existence on the file system.
+    Gets relative paths to a film's still images, in order, from the asset index
+    (any number of stills, any image extension).
     """
-    stills = []
-    # Checks for _1.jpg, _2.jpg, _3.jpg (adjust range as needed)
-    for i in range(1, 4):
-        full_still_file_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)),
-            STILLS_DIR.replace('../', ''),
-            film_sanitized_title,
-            f"{film_sanitized_title}_{i}.jpg"
-        )
-        if os.path.exists(full_still_file_path):
-            relative_still_path = f"{STILLS_DIR}/{film_sanitized_title}/{film_sanitized_title}_{i}.jpg"
-            stills.append(relative_still_path)
-    return stills
+    entry = index.get(film_sanitized_title)
+    return [f"../{still['path']}" for still in entry['stills']] if entry else []
 
 
-# ---------------------- Main Logic ----------------------
-os.makedirs(OUTPUT_DIR, exist_ok=True)
-
-try:
-    with open(JSON_PATH, 'r', encoding='utf-8') as f:
-        films = json.load(f)
-except FileNotFoundError:
-    print(f"Error: JSON file not found at {JSON_PATH}. Please ensure the data extraction script ran successfully.")
-    exit()
-except json.JSONDecodeError:
-    print(f"Error: Could not decode JSON from {JSON_PATH}. Check file for valid JSON format.")
-    exit()
-
-for film in films:
+def get_film_poster(film_sanitized_title, index):
+    """
+    Gets the relative path to a film's poster from the asset index, falling back
+    to the default poster if the film has none.
+    """
+    entry = index.get(film_sanitized_title)
+    if entry and entry['poster']:
+        return f"../{entry['poster']['path']}"
+    return f"{POSTER_DIR}/default_poster.jpg"
+
+
+def publish_page_assets(output_dir=OUTPUT_DIR):
+    """
+    Publishes the film page stylesheet and script under fingerprinted names into the
+    css/ and js/ folders the pages in output_dir link to (relative to the site being built).
+    Returns their page-relative URLs as template values.
+    """
+    stylesheet = static_assets.publish_asset(page_templates.template_path(FILM_STYLESHEET),
+                                             os.path.normpath(os.path.join(output_dir, CSS_DIR)))
+    script = static_assets.publish_asset(page_templates.template_path(FILM_SCRIPT),
+                                         os.path.normpath(os.path.join(output_dir, JS_DIR)))
+    return {
+        'stylesheet_href': f"{CSS_DIR}/{stylesheet}",
+        'script_href': f"{JS_DIR}/{script}",
+    }
+
+
+def placeholder_attributes(image):
+    """
+    width/height (so the browser reserves the space before the image loads) and a
+    background of the image's dominant colour and blurred placeholder, from an asset index image.
+    """
+    if not image or not image['width']:
+        return ""
+    attributes = f'width="{image["width"]}" height="{image["height"]}" '
+    if image['placeholder']:
+        attributes += (f'style="background:{image["color"]} url({image["placeholder"]}) '
+                       f'center/cover no-repeat" ')
+    return attributes
+
+
+def picture_html(src, derivatives, sizes, attributes, image=None):
+    """
+    Returns the <img> for src with the given attributes. When the image has resized
+    derivatives it gets a srcset/sizes and is wrapped in a <picture> offering the
+    AVIF/WebP variants first; src itself stays the original (used by the lightboxes).
+    image (from the asset index) adds its dimensions and placeholder.
+    """
+    attributes = placeholder_attributes(image) + attributes
+    if not derivatives:
+        return f'<img src="{src}" {attributes} />'
+    prefix = '../'
+    variants = derivatives['variants']
+    sources = [f'<source type="{image_derivatives.MIME_TYPES[fmt]}" '
+               f'srcset="{image_derivatives.srcset(variants[fmt], prefix)}" sizes="{sizes}" />'
+               for fmt in image_derivatives.FORMATS if fmt != 'jpg' and fmt in variants]
+    img = (f'<img src="{src}" srcset="{image_derivatives.srcset(variants["jpg"], prefix)}" '
+           f'sizes="{sizes}" {attributes} />')
+    return "".join(["<picture>", *sources, img, "</picture>"])
+
+
+def page_image_derivatives(manifest, output_dir, image_paths):
+    """Maps each page-relative image path to its derivatives entry from the build manifest (if any)."""
+    cached = manifest.get('derivatives', {})
+    return {p: cached.get(os.path.normpath(os.path.join(output_dir, p)).replace(os.sep, '/')) for p in image_paths}
+
+
+def page_images(entry):
+    """Maps the page-relative path of each of a film's images to its asset index entry."""
+    if not entry:
+        return {}
+    return {f"../{image['path']}": image for image in [entry['poster'], *entry['stills']] if image}
+
+
+def film_page_slug(film):
+    """Returns the sanitized title used for a film's page filename and image folders."""
+    return sanitize_filename(film.get("Film", {}).get("Title_English", "Untitled Film"))
+
+
+def render_film_page(film, poster_path, all_stills, assets, derivatives=None, images=None):
+    """
+    Renders the detail page HTML for one merged film record; assets comes from publish_page_assets(),
+    derivatives from page_image_derivatives() and images from page_images().
+    """
+    derivatives = derivatives or {}
+    images = images or {}
     fdata = film.get("Film", {})
     title_en = fdata.get("Title_English", "Untitled Film")
     title_orig = fdata.get("Title_Original", "")
-    fname_sanitized = sanitize_filename(title_en)
 
     # --- Prepare data for template ---
     genre_list = [g for g in fdata.get("Genre_List", []) if g]
@@ -617,37 +239,34 @@ for film in films:
     if target_rating or target_audience:
         target_group_content = f"{target_rating}{', ' if target_rating and target_audience else ''}{target_audience}"
 
-    # Get all stills for the current film
-    all_stills = get_film_stills(fname_sanitized)
-
     # --- HTML for the prominently displayed first still ---
     main_still_html = ""
     if all_stills:
         # The first still, with a unique ID and data-stills for lightbox
-        main_still_html = f'<img src="{all_stills[0]}" alt="Still" class="main-film-still" id="main-film-still" data-stills=\'{json.dumps(all_stills)}\' />'
+        main_still_html = picture_html(
+            all_stills[0], derivatives.get(all_stills[0]), STILL_SIZES,
+            f'alt="Still" class="main-film-still" id="main-film-still" data-stills=\'{json.dumps(all_stills)}\'',
+            images.get(all_stills[0]))
     else:
         main_still_html = "<p>No stills available.</p>"
 
     # --- HTML for the hidden stills gallery (only for lightbox data) ---
     stills_gallery_for_lightbox_data = ""
     if all_stills:
-        stills_gallery_for_lightbox_data = f'<div class="stills-gallery" style="display:none;">'
-        for still_url in all_stills:
-            stills_gallery_for_lightbox_data += f'<img src="{still_url}" alt="Still Thumbnail (hidden)" data-stills=\'{json.dumps(all_stills)}\' />'
-        stills_gallery_for_lightbox_data += '</div>'
-
+        stills_json = json.dumps(all_stills)
+        stills_gallery_for_lightbox_data = "".join([
+            '<div class="stills-gallery" style="display:none;">',
+            *[f'<img src="{still_url}" alt="Still Thumbnail (hidden)" data-stills=\'{stills_json}\' />'
+              for still_url in all_stills],
+            '</div>',
+        ])
 
     # Generate trailer embed HTML (direct embed)
     trailer_embed_html_content = build_trailer_embed(film.get("Trailer_url"))
 
-    # Construct poster path
-    poster_path = f"{POSTER_DIR}/{fname_sanitized}/{fname_sanitized}.jpg"
-    # Fallback for poster if not found in specific folder
-    if not os.path.exists(os.path.join(os.path.dirname(os.path.abspath(__file__)), POSTER_DIR.replace('../', ''), fname_sanitized, f"{fname_sanitized}.jpg")):
-        poster_path = f"{POSTER_DIR}/default_poster.jpg"
-
     # Fill the template
-    html = FILM_TEMPLATE.format(
+    return page_templates.render_template(
+        FILM_TEMPLATE,
         title_english=title_en,
         title_original=title_orig,
         genre=genre_combined,
@@ -657,6 +276,8 @@ for film in films:
         subtitles=subtitles,
         country=country,
         poster_image=poster_path,
+        poster_html=picture_html(poster_path, derivatives.get(poster_path), POSTER_SIZES,
+                                 'alt="Poster" class="film-poster" id="poster-img"', images.get(poster_path)),
         main_still_html=main_still_html, # New placeholder for the main still
         stills_gallery_for_lightbox_data=stills_gallery_for_lightbox_data, # New placeholder for the hidden gallery
         trailer_html=trailer_embed_html_content,
@@ -679,11 +300,105 @@ for film in films:
                                    if v]),
         downloads=film.get("Downloads", "—"),
         status=fdata.get("Status", "—"),
+        **assets,
+    )
+
+
+def load_films(json_path=JSON_PATH):
+    """
+    Loads the merged film records from disk.
+    Returns None (after printing the reason) if the file is missing or invalid.
+    """
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"Error: JSON file not found at {json_path}. Please ensure the data extraction script ran successfully.")
+    except json.JSONDecodeError:
+        print(f"Error: Could not decode JSON from {json_path}. Check file for valid JSON format.")
+    return None
+
+
+def generate_pages(films, output_dir=OUTPUT_DIR, manifest=None, incremental=False, index=None):
+    """
+    Renders and writes one page per film into output_dir.
+    films may be any iterable, e.g. the streaming film_store.iter_records().
+
+    In incremental mode, pages whose inputs (film record, poster, stills and their derivatives, this
+    generator, its template and the fingerprinted asset names) hash the same as in the build manifest are skipped.
+    When no manifest is passed in, it is loaded and saved here; when no asset index
+    (asset_index.build_index) is passed in, images/ is scanned here.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+
+    owns_manifest = manifest is None
+    if owns_manifest:
+        manifest = build_manifest.load_manifest()
+    if index is None:
+        index = asset_index.build_index(manifest)
+    assets = publish_page_assets(output_dir)
+    generator_digest = build_manifest.combine_digests(
+        build_manifest.file_digest(manifest, os.path.abspath(__file__)),
+        build_manifest.file_digest(manifest, page_templates.template_path(FILM_TEMPLATE)),
+        build_manifest.data_digest(assets),
     )
+    page_digests = {}
+
+    film_count = 0
+    rendered_count = 0
+    for film in films:
+        film_count += 1
+        fname_sanitized = film_page_slug(film)
+        all_stills = get_film_stills(fname_sanitized, index)
+        poster_path = get_film_poster(fname_sanitized, index)
+
+        output_filename = os.path.join(output_dir, f"{fname_sanitized}.html")
+        image_paths = [poster_path] + all_stills
+        derivatives = page_image_derivatives(manifest, output_dir, image_paths)
+        page_digest = build_manifest.combine_digests(
+            generator_digest,
+            build_manifest.data_digest(film),
+            build_manifest.data_digest(derivatives),
+            *[build_manifest.file_digest(manifest, os.path.normpath(os.path.join(output_dir, p))) for p in image_paths],
+        )
+        page_digests[output_filename] = page_digest
+        if incremental and manifest['pages'].get(output_filename) == page_digest and os.path.exists(output_filename):
+            build_trace.count('pages_up_to_date')
+            continue
+
+        with build_trace.span(fname_sanitized, 'render', stills=len(all_stills)):
+            html = render_film_page(film, poster_path, all_stills, assets, derivatives,
+                                    page_images(index.get(fname_sanitized)))
+
+            # Write the HTML file
+            with open(output_filename, 'w', encoding='utf-8') as out:
+                out.write(html)
+        build_trace.file_written(output_filename)
+        rendered_count += 1
+
+    manifest['pages'] = page_digests
+    if owns_manifest:
+        build_manifest.save_manifest(manifest)
+
+    if incremental:
+        print(f"Generated {rendered_count} film pages in '{output_dir}' folder ({film_count - rendered_count} up to date).")
+    else:
+        print(f"Generated {film_count} film pages in '{output_dir}' folder.")
+    return rendered_count
 
-    # Write the HTML file
-    output_filename = os.path.join(OUTPUT_DIR, f"{fname_sanitized}.html")
-    with open(output_filename, 'w', encoding='utf-8') as out:
-        out.write(html)
 
-print(f"Generated {len(films)} film pages in '{OUTPUT_DIR}' folder.")
+# ---------------------- Main Logic ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the film detail pages.")
+    parser.add_argument('--incremental', action='store_true', help="only re-render pages whose inputs changed")
+    parser.add_argument('--store', default='json', choices=['json', 'jsonl'],
+                        help=f"read films from {JSON_PATH} or stream them from {film_store.JSONL_PATH}")
+    args = parser.parse_args()
+
+    if args.store == 'jsonl':
+        films = film_store.iter_records()
+    else:
+        films = load_films()
+        if films is None:
+            sys.exit(1)
+    generate_pages(films, incremental=args.incremental)
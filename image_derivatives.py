@@ -0,0 +1,172 @@
+import os
+import json
+
+import asset_index
+import build_manifest
+import build_trace
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional: without it pages link the original images
+    Image = None
+
+# ---------------------- Configuration ----------------------
+IMAGES_DIR = 'images'
+DERIVED_DIR = 'images/derived'
+# The manifest's derivatives section, committed with the derived images: a fresh clone (no
+# build manifest, checkout mtimes) then knows its derivatives are current and re-encodes nothing.
+DERIVED_INDEX_PATH = 'images/derived/derivatives.json'
+# Source folders and the widths derived from them. Posters and page stills are shown in a
+# 250px column (640w covers 2x screens); catalogue cards are 350px wide, full width on phones.
+DERIVATIVE_WIDTHS = {
+    'posters': [320, 640],
+    'stills': [320, 640, 960],
+}
+# Output formats, best first. jpg is always written; webp/avif only if Pillow can encode them.
+FORMATS = ['avif', 'webp', 'jpg']
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpg': 'image/jpeg'}
+SAVE_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality': 55},
+    'webp': {'format': 'WEBP', 'quality': 78, 'method': 4},
+    'jpg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+}
+
+
+# ---------------------- Helper Functions ----------------------
+
+def available_formats():
+    """Returns the output formats the installed Pillow can encode (empty without Pillow)."""
+    if Image is None:
+        return []
+    return [fmt for fmt in FORMATS if fmt == 'jpg' or features.check(fmt)]
+
+
+def derivative_path(source_path, width, fmt):
+    """images/stills/home/home_1.jpg -> images/derived/stills/home/home_1-640w.webp"""
+    relative = os.path.relpath(source_path, IMAGES_DIR)
+    stem = os.path.splitext(relative)[0]
+    return os.path.join(DERIVED_DIR, f"{stem}-{width}w.{fmt}").replace(os.sep, '/')
+
+
+def iter_source_images(index):
+    """Yields (path, widths) for every poster and still in the asset index, in a stable order."""
+    for kind, image in asset_index.iter_images(index):
+        yield image['path'], DERIVATIVE_WIDTHS[kind]
+
+
+def write_derivatives(source_path, widths, formats):
+    """
+    Writes every width x format derivative of one source image.
+    Widths above the source width are written at the source width (never upscaled),
+    so every configured file name exists. Returns the manifest entry for the source.
+    """
+    with Image.open(source_path) as im:
+        im = ImageOps.exif_transpose(im)
+        if im.mode not in ('RGB', 'L'):
+            im = im.convert('RGB')
+        source_size = im.size
+        variants = {fmt: [] for fmt in formats}
+        for width in widths:
+            actual_width = min(width, source_size[0])
+            height = round(source_size[1] * actual_width / source_size[0])
+            resized = im.resize((actual_width, height), Image.LANCZOS) if actual_width != source_size[0] else im
+            for fmt in formats:
+                path = derivative_path(source_path, width, fmt)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                resized.save(path, **SAVE_OPTIONS[fmt])
+                build_trace.file_written(path)
+                variants[fmt].append([actual_width, path])
+    return {'size': list(source_size), 'variants': variants}
+
+
+def build_derivatives(manifest, index=None):
+    """
+    Build stage: makes sure every poster and still has its resized derivatives.
+    A source is only re-encoded when its content, the widths or the output formats changed
+    (tracked in the manifest's 'derivatives' section, and in DERIVED_INDEX_PATH for sources the
+    manifest doesn't know yet), also in full builds, since encoding is by far the slowest step.
+    Derivatives of removed sources are deleted.
+    index is the asset_index scan of images/ (scanned here if not given).
+    Returns the number of source images (re)processed.
+    """
+    formats = available_formats()
+    if not formats:
+        print("Pillow is not installed; skipping image derivatives (pages link the original images).")
+        return 0
+
+    index = asset_index.build_index(manifest) if index is None else index
+    cached = {**load_derived_index(), **manifest.setdefault('derivatives', {})}
+    current = {}
+    processed = 0
+    for source_path, widths in iter_source_images(index):
+        digest = build_manifest.combine_digests(build_manifest.file_digest(manifest, source_path),
+                                                build_manifest.data_digest([widths, formats, SAVE_OPTIONS]))
+        entry = cached.get(source_path)
+        if (entry and entry['sha256'] == digest
+                and all(os.path.exists(path) for variants in entry['variants'].values() for _, path in variants)):
+            current[source_path] = entry
+            continue
+        try:
+            with build_trace.span(source_path, 'derivatives'):
+                entry = write_derivatives(source_path, widths, formats)
+        except OSError as e:
+            print(f"Error creating derivatives of {source_path}: {e}")
+            continue
+        entry['sha256'] = digest
+        current[source_path] = entry
+        processed += 1
+
+    remove_stale_derivatives(current)
+    manifest['derivatives'] = current
+    save_derived_index(current)
+    print(f"Image derivatives: {processed} image(s) processed, {len(current) - processed} up to date.")
+    return processed
+
+
+def load_derived_index(path=DERIVED_INDEX_PATH):
+    """The committed derivatives entries ({} if missing or unreadable)."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_derived_index(entries, path=DERIVED_INDEX_PATH):
+    """Writes the derivatives entries next to the derived images, only if they changed."""
+    if entries == load_derived_index(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=1, sort_keys=True)
+        f.write('\n')
+    build_trace.file_written(path)
+
+
+def remove_stale_derivatives(entries):
+    """Deletes files under DERIVED_DIR that no current derivative entry refers to."""
+    keep = {path for entry in entries.values() for variants in entry['variants'].values() for _, path in variants}
+    for root, dirs, files in os.walk(DERIVED_DIR, topdown=False):
+        for filename in files:
+            path = os.path.join(root, filename).replace(os.sep, '/')
+            if path not in keep and filename.lower().endswith(tuple(f".{fmt}" for fmt in FORMATS)):
+                os.remove(path)
+        if root != DERIVED_DIR and not os.listdir(root):
+            os.rmdir(root)
+
+
+def srcset(variants, prefix=''):
+    """'a-320w.jpg 320w, a-640w.jpg 640w' from [[width, path], ...], skipping repeated widths.
+    prefix is prepended to every path (e.g. '../' for pages in film_pages/)."""
+    seen = set()
+    candidates = []
+    for width, path in variants:
+        if width not in seen:
+            seen.add(width)
+            candidates.append(f"{prefix}{path} {width}w")
+    return ", ".join(candidates)
+
+
+def jpeg_srcset(entry, prefix=''):
+    """srcset of the JPEG derivatives in a manifest 'derivatives' entry ('' if the image has none)."""
+    return srcset(entry['variants'].get('jpg', []), prefix) if entry else ''
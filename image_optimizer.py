@@ -0,0 +1,195 @@
+import os
+import shutil
+import struct
+import hashlib
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+
+import asset_index
+import build_manifest
+
+# ---------------------- Configuration ----------------------
+# Lossless optimisation of the poster and still originals, in place:
+#   - metadata is stripped (EXIF/XMP/Photoshop blocks, comments); the ICC colour profile,
+#     the Adobe colour-transform marker and a non-default EXIF orientation are kept
+#   - if libjpeg's jpegtran is on the PATH, Huffman tables are optimised and the file is
+#     rewritten as progressive JPEG (jpegtran never touches the DCT coefficients)
+# Optimised bytes are cached in CACHE_DIR under the SHA-256 of the source they came from,
+# so a re-checked-out original is restored from the cache instead of being recompressed.
+CACHE_DIR = 'data/image_cache'
+JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+JPEGTRAN_ARGS = ['-copy', 'all', '-optimize', '-progressive']
+
+SOI, SOS = 0xD8, 0xDA
+APP0, APP1, APP2, APP14, COM = 0xE0, 0xE1, 0xE2, 0xEE, 0xFE
+STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}  # TEM and RST0-7 carry no length
+
+
+# ---------------------- Helper Functions ----------------------
+
+def find_jpegtran():
+    """Returns the path of the jpegtran executable, or None."""
+    return shutil.which('jpegtran')
+
+
+def exif_orientation(payload):
+    """Returns the EXIF orientation tag from an APP1 payload, or None if it has none."""
+    if not payload.startswith(b'Exif\x00\x00'):
+        return None
+    tiff = payload[6:]
+    try:
+        byte_order = {b'II': '<', b'MM': '>'}[tiff[:2]]
+        ifd_offset = struct.unpack(byte_order + 'I', tiff[4:8])[0]
+        entry_count = struct.unpack(byte_order + 'H', tiff[ifd_offset:ifd_offset + 2])[0]
+        for i in range(entry_count):
+            entry = tiff[ifd_offset + 2 + 12 * i:ifd_offset + 14 + 12 * i]
+            tag, _, _, value = struct.unpack(byte_order + 'HHI4s', entry)
+            if tag == 0x0112:
+                return struct.unpack(byte_order + 'H', value[:2])[0]
+    except (KeyError, struct.error):
+        return None
+    return None
+
+
+def keep_segment(marker, payload):
+    """Whether a JPEG header segment is needed to display the image exactly as before."""
+    if marker in (APP0, APP14):
+        return True
+    if marker == APP2:
+        return payload.startswith(b'ICC_PROFILE\x00')
+    if marker == APP1:
+        return exif_orientation(payload) not in (None, 1)
+    return not (0xE0 <= marker <= 0xEF or marker == COM)
+
+
+def strip_metadata(data):
+    """
+    Drops metadata segments from a JPEG without touching the compressed image data.
+    Returns the data unchanged if it doesn't parse as a JPEG.
+    """
+    if data[:2] != bytes([0xFF, SOI]):
+        return data
+    out = [data[:2]]
+    i = 2
+    while i + 4 <= len(data):
+        if data[i] != 0xFF:
+            return data
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker in STANDALONE_MARKERS:
+            out.append(data[i:i + 2])
+            i += 2
+            continue
+        length = struct.unpack('>H', data[i + 2:i + 4])[0]
+        if marker == SOS:
+            out.append(data[i:])  # scan data and everything after it are copied verbatim
+            return b''.join(out)
+        if keep_segment(marker, data[i + 4:i + 2 + length]):
+            out.append(data[i:i + 2 + length])
+        i += 2 + length
+    return data
+
+
+def optimize_jpeg(data, jpegtran=None):
+    """Returns the losslessly optimised JPEG bytes, never larger than the input."""
+    optimized = strip_metadata(data)
+    if jpegtran:
+        result = subprocess.run([jpegtran, *JPEGTRAN_ARGS], input=optimized, capture_output=True)
+        if result.returncode == 0 and result.stdout[:2] == bytes([0xFF, SOI]):
+            optimized = result.stdout
+    return optimized if len(optimized) < len(data) else data
+
+
+def optimize_file(path, source_digest, cache_dir, jpegtran):
+    """
+    Optimises one image into the cache (worker function, runs in the process pool).
+    Returns the SHA-256 of the optimised bytes; the cache file is only written if they differ.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    optimized = optimize_jpeg(data, jpegtran)
+    if optimized is data:
+        return source_digest
+    with open(cache_path(cache_dir, source_digest), 'wb') as f:
+        f.write(optimized)
+    return hashlib.sha256(optimized).hexdigest()
+
+
+def cache_path(cache_dir, source_digest):
+    return os.path.join(cache_dir, f"{source_digest}.jpg")
+
+
+def replace_from_cache(path, cache_dir, source_digest):
+    """Atomically replaces path with the cached optimised version of its current content."""
+    tmp_path = f"{path}.tmp"
+    shutil.copyfile(cache_path(cache_dir, source_digest), tmp_path)
+    os.replace(tmp_path, path)
+
+
+def optimize_images(manifest, jobs=1, cache_dir=CACHE_DIR, index=None):
+    """
+    Build stage: losslessly optimises every poster and still in place.
+    The manifest's 'optimized' section maps source hash -> optimised hash. Images whose
+    hash is already an optimised one are skipped; known sources are restored from the
+    cache; only new or changed images are optimised, in a process pool with jobs > 1
+    (0 meaning one per CPU). Cache entries no current image refers to are evicted.
+    index is the asset_index scan of images/ (scanned here if not given).
+    Returns the number of images rewritten.
+    """
+    jpegtran = find_jpegtran()
+    os.makedirs(cache_dir, exist_ok=True)
+    known = manifest.setdefault('optimized', {})
+    optimized_digests = set(known.values())
+
+    index = asset_index.build_index(manifest) if index is None else index
+    paths = [image['path'] for _, image in asset_index.iter_images(index)
+             if image['path'].lower().endswith(JPEG_EXTENSIONS)]
+    current = {}  # source hash -> optimised hash, for the images present now
+    to_optimize = []
+    for path in paths:
+        digest = build_manifest.file_digest(manifest, path)
+        if digest in optimized_digests:
+            current.update({source: output for source, output in known.items() if output == digest})
+        elif digest in known and (known[digest] == digest or os.path.exists(cache_path(cache_dir, digest))):
+            current[digest] = known[digest]
+            to_optimize.append((path, digest, True))
+        else:
+            to_optimize.append((path, digest, False))
+
+    jobs = jobs or os.cpu_count() or 1
+    compress = [(path, digest) for path, digest, cached in to_optimize if not cached]
+    executor = ProcessPoolExecutor(max_workers=min(jobs, len(compress))) if jobs > 1 and len(compress) > 1 else None
+    try:
+        if executor:
+            pending = iter([executor.submit(optimize_file, path, digest, cache_dir, jpegtran)
+                            for path, digest in compress])
+        rewritten = 0
+        saved_bytes = 0
+        for path, digest, cached in to_optimize:
+            if not cached:
+                try:
+                    current[digest] = (next(pending).result() if executor
+                                       else optimize_file(path, digest, cache_dir, jpegtran))
+                except OSError as e:
+                    print(f"Error optimizing {path}: {e}")
+                    continue
+            if current[digest] != digest:
+                size_before = os.path.getsize(path)
+                replace_from_cache(path, cache_dir, digest)
+                saved_bytes += size_before - os.path.getsize(path)
+                rewritten += 1
+    finally:
+        if executor:
+            executor.shutdown()
+
+    manifest['optimized'] = current
+    for filename in os.listdir(cache_dir):
+        if os.path.splitext(filename)[0] not in current:
+            os.remove(os.path.join(cache_dir, filename))
+
+    print(f"Image optimization: {rewritten} image(s) rewritten, {saved_bytes // 1024} KB saved, "
+          f"{len(paths) - len(to_optimize)} already optimized"
+          f"{'' if jpegtran else ' (jpegtran not found: metadata stripping only)'}.")
+    return rewritten
@@ -1,39 +1,161 @@
+import argparse
 import json
 import re
 
+import build_trace
+import film_store
+
+ADITIONAL_INFO_PATH = "data/aditional_info.json"
+ALL_HTML_DATA_PATH = "data/all_html_data.json"
+
+# What to do when a side-car field collides with a different value already on the film
+# (extracted from the questionnaire, or set by an earlier duplicate side-car row):
+#   'sidecar'        the side-car value wins (later rows win over earlier ones)
+#   'questionnaire'  the existing value is kept
+#   'error'          the merge stops with a ValueError
+CONFLICT_POLICIES = ['sidecar', 'questionnaire', 'error']
+
+
 # Step 1: Fix and load aditional_info.json
-with open("data/aditional_info.json", "r", encoding="utf-8") as f:
-    raw_text = f.read()
+def load_aditional_info(path=ADITIONAL_INFO_PATH):
+    """Loads the hand-maintained side-car file, fixing its common formatting issues."""
+    with open(path, "r", encoding="utf-8") as f:
+        raw_text = f.read()
+    build_trace.file_read(path)
+
+    # Fix common JSON formatting issues
+    fixed_text = re.sub(r",\s*([}\]])", r"\1", raw_text)
+    fixed_text = fixed_text.replace('"Review:', '"Review"')
+    fixed_text = fixed_text.replace('"Review" "Milan Marčetić"', '"Review": "Milan Marčetić"')
 
-# Fix common JSON formatting issues
-fixed_text = re.sub(r",\s*([}\]])", r"\1", raw_text)
-fixed_text = fixed_text.replace('"Review:', '"Review"')
-fixed_text = fixed_text.replace('"Review" "Milan Marčetić"', '"Review": "Milan Marčetić"')
+    return json.loads(fixed_text)
 
-aditional_info = json.loads(fixed_text)
 
 # Step 2: Load all_html_data.json
-with open("data/all_html_data.json", "r", encoding="utf-8") as f:
-    all_html_data = json.load(f)
+def load_all_html_data(path=ALL_HTML_DATA_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
 
 
 # Step 3: Merge based on Title_Original and Title_English
-def match_titles(film1, film2):
-    return (
-            film1["Title_Original"] == film2["Title_Original"] and
-            film1["Title_English"] == film2["Title_English"]
-    )
+def film_key(film):
+    """The join key of a film: its (Title_Original, Title_English) pair."""
+    return film.get("Title_Original", ""), film.get("Title_English", "")
+
+
+def index_by_key(entries):
+    """Groups side-car entries by film key, keeping their original order within each key."""
+    index = {}
+    for entry in entries:
+        index.setdefault(film_key(entry.get("Film", {})), []).append(entry)
+    return index
+
+
+def iter_merged(all_html_data, aditional_info, report, conflict_policy='sidecar'):
+    """
+    Yields the extracted film records one at a time with the matching side-car
+    fields merged in, so all_html_data may be a stream (e.g. film_store.iter_records()).
+    Side-car rows are looked up through a hash index on the film key, so the merge is
+    linear in the number of films plus side-car rows.
+    The report dict is filled in as films go by and is complete once the stream is exhausted:
+    unmatched keys, duplicate keys and field conflicts. Records without film titles (a form
+    missing its "1. Film" section) are passed through unmerged and listed as untitled.
+    The input records are left untouched (they may be cached build-manifest entries).
+    """
+    if conflict_policy not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy '{conflict_policy}'. Use one of: {', '.join(CONFLICT_POLICIES)}")
 
+    info_by_key = index_by_key(aditional_info)
+    film_key_counts = {}
+    report.update({
+        'unmatched_films': [],
+        'untitled_films': [],  # Source_File of records without titles
+        'unmatched_info': [],
+        'duplicate_films': [],
+        'duplicate_info': [key for key, entries in info_by_key.items() if len(entries) > 1],
+        'conflicts': [],
+    })
+
+    for film_entry in all_html_data:
+        film_entry = dict(film_entry)
+        key = film_key(film_entry.get("Film", {}))
+        if not any(key):
+            report['untitled_films'].append(film_entry.get("Source_File", "?"))
+            yield film_entry
+            continue
+        film_key_counts[key] = film_key_counts.get(key, 0) + 1
+        for info_entry in info_by_key.get(key, []):
+            for field, value in info_entry.items():
+                if field == "Film":  # Don't overwrite the Film object
+                    continue
+                if field in film_entry and film_entry[field] != value:
+                    report['conflicts'].append((key, field, film_entry[field], value))
+                    if conflict_policy == 'error':
+                        raise ValueError(f"Conflicting values for '{field}' of {key}: "
+                                         f"{film_entry[field]!r} vs {value!r}")
+                    if conflict_policy == 'questionnaire':
+                        continue
+                film_entry[field] = value
+        yield film_entry
+
+    report['unmatched_films'] = [key for key in film_key_counts if key not in info_by_key]
+    report['unmatched_info'] = [key for key in info_by_key if key not in film_key_counts]
+    report['duplicate_films'] = [key for key, count in film_key_counts.items() if count > 1]
+
+
+def merge_aditional_info(all_html_data, aditional_info, conflict_policy='sidecar'):
+    """
+    Returns (merged, report): the film records with the side-car fields merged in
+    (see iter_merged) and the merge report.
+    """
+    report = {}
+    merged = list(iter_merged(all_html_data, aditional_info, report, conflict_policy))
+    build_trace.count('films_merged', len(merged))
+    build_trace.count('merge_conflicts', len(report['conflicts']))
+    return merged, report
+
+
+def print_merge_report(report, conflict_policy='sidecar'):
+    """Prints the merge report; prints nothing when every key matched exactly once without conflicts."""
+    for key in report['unmatched_films']:
+        print(f"⚠️ No aditional_info entry for film {key}")
+    for source in report['untitled_films']:
+        print(f"⚠️ No film titles in questionnaire {source}, no aditional_info entry merged")
+    for key in report['unmatched_info']:
+        print(f"⚠️ aditional_info entry {key} matches no questionnaire")
+    for key in report['duplicate_films']:
+        print(f"⚠️ Several questionnaires share the key {key}")
+    for key in report['duplicate_info']:
+        print(f"⚠️ Several aditional_info entries share the key {key}")
+    for key, field, old, new in report['conflicts']:
+        kept = new if conflict_policy == 'sidecar' else old
+        print(f"⚠️ Conflicting '{field}' for {key}: {old!r} vs {new!r}, kept {kept!r}")
 
-for film_entry in all_html_data:
-    for info_entry in aditional_info:
-        if match_titles(film_entry["Film"], info_entry["Film"]):
-            for key, value in info_entry.items():
-                if key != "Film":  # Don't overwrite the Film object
-                    film_entry[key] = value
 
 # Step 4: Save the result
-with open("data/all_html_data.json", "w", encoding="utf-8") as f:
-    json.dump(all_html_data, f, ensure_ascii=False, indent=2)
+def save_merged_data(all_html_data, path=ALL_HTML_DATA_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(all_html_data, f, ensure_ascii=False, indent=2)
+    build_trace.file_written(path)
+
+    print(f"✅ Merged file saved as {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge data/aditional_info.json into data/all_html_data.json.")
+    parser.add_argument('--conflict-policy', default='sidecar', choices=CONFLICT_POLICIES,
+                        help="which value wins when a side-car field collides with an existing one")
+    parser.add_argument('--store', default='json', choices=['json', 'jsonl'],
+                        help=f"merge {ALL_HTML_DATA_PATH} in place, or the JSON-Lines store {film_store.JSONL_PATH}")
+    args = parser.parse_args()
 
-print("✅ Merged file saved as data/all_html_data.json")
+    if args.store == 'jsonl':
+        report = {}
+        appended = film_store.upsert_records(
+            iter_merged(film_store.iter_records(), load_aditional_info(), report, args.conflict_policy))
+        print_merge_report(report, args.conflict_policy)
+        print(f"✅ Merged {appended} changed film(s) into {film_store.JSONL_PATH}")
+    else:
+        merged, report = merge_aditional_info(load_all_html_data(), load_aditional_info(), args.conflict_policy)
+        print_merge_report(report, args.conflict_policy)
+        save_merged_data(merged)
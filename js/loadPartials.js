@@ -1,6 +1,11 @@
 // loadPartials.js — partial loader + burger + SEARCH OVERLAY + SLIDING HEADER
 document.addEventListener('DOMContentLoaded', loadPartials);
 
+// Site root = the folder above js/. Resolved from this script's own URL (document.currentScript is only
+// set while the script first runs), so data URLs work at /, /index.html and under any project folder.
+const SITE_ROOT = document.currentScript ? new URL('../', document.currentScript.src) : new URL('./', location.href);
+const siteUrl = (path) => new URL(path, SITE_ROOT).href;
+
 async function loadPartials() {
   const clean = (s) => s.replace(/\/+$/,'');
   const parts = clean(location.pathname).split('/').filter(Boolean);
@@ -26,15 +31,15 @@ async function loadPartials() {
     return null;
   };
 
-  // Inject header/footer if hosts exist
+  // Inject header/footer if hosts exist and the build didn't already inline them (page_includes.py)
   const headerHost = document.getElementById('header-container');
   const footerHost = document.getElementById('footer-container');
 
-  if (headerHost) {
+  if (headerHost && !headerHost.firstElementChild) {
     const header = await fetchFirstOk('header.html');
     if (header) headerHost.innerHTML = header.text;
   }
-  if (footerHost) {
+  if (footerHost && !footerHost.firstElementChild) {
     const footer = await fetchFirstOk('footer.html');
     if (footer) footerHost.innerHTML = footer.text;
   }
@@ -43,7 +48,7 @@ async function loadPartials() {
   initHeaderSpacer();
   initSlidingHeader();
   initBurgerMenu();
-  initSearchOverlay(projectBase);
+  initSearchOverlay();
 
   window.addEventListener('load', initHeaderSpacer);
   window.addEventListener('resize', debounce(initHeaderSpacer, 150));
@@ -141,7 +146,7 @@ function initBurgerMenu(){
 }
 
 /* ============== SEARCH OVERLAY ============== */
-function initSearchOverlay(projectBase){
+function initSearchOverlay(){
   const openBtn = document.getElementById('header-search-toggle');
   const overlay  = document.getElementById('search-overlay');
   const input    = document.getElementById('search-overlay-input');
@@ -154,7 +159,7 @@ function initSearchOverlay(projectBase){
   const getAllFilms = async () => {
     if (Array.isArray(window.allFilms) && window.allFilms.length) return window.allFilms;
     try {
-      const r = await fetch(projectBase + 'data/all_html_data.json', { cache: 'no-cache' });
+      const r = await fetch(siteUrl('data/catalogue.json'), { cache: 'no-cache' });
       if (!r.ok) return [];
       const data = await r.json();
       return Array.isArray(data) ? data : [];
@@ -164,6 +169,7 @@ function initSearchOverlay(projectBase){
   };
 
   let FILMS_CACHE = null;
+  let SEARCH_INDEX = null;
 
   // Lock background scroll while allowing overlay to scroll
   const isInsidePanel = (target) => !!(target && target.closest('.search-overlay__panel'));
@@ -192,7 +198,9 @@ function initSearchOverlay(projectBase){
     document.body.classList.remove('header--hidden');
     openBtn.setAttribute('aria-expanded', 'true');
 
-    if (!FILMS_CACHE) FILMS_CACHE = await getAllFilms();
+    if (!FILMS_CACHE || !SEARCH_INDEX) [FILMS_CACHE, SEARCH_INDEX] = await Promise.all([
+      FILMS_CACHE || getAllFilms(), loadSearchIndex(siteUrl('data/search_index.json'))
+    ]);
 
     input.value = '';
     render();
@@ -211,16 +219,15 @@ function initSearchOverlay(projectBase){
 
   const filterFilms = () => {
     const q = normalize(input.value);
-    if (!q) return FILMS_CACHE;
+    if (!q.trim()) return FILMS_CACHE;
 
+    if (SEARCH_INDEX) {
+      const ids = searchFilmIds(SEARCH_INDEX, q);
+      return ids ? FILMS_CACHE.filter(item => ids.has(item.id)) : FILMS_CACHE;
+    }
+    // No search index: plain substring match on the catalogue fields
     return FILMS_CACHE.filter(item => {
-      const F = item.Film || {};
-      const C = item.Crew || {};
-      const hay = [
-        F.Title_English, F.Title_Original,
-        C['Director(s)'],
-        item.Logline, item.Synopsis
-      ].map(x => normalize(x)).join(' ');
+      const hay = [item.title, item.title_original, item.director, item.logline].map(x => normalize(x)).join(' ');
       return hay.includes(q);
     });
   };
@@ -237,12 +244,10 @@ function initSearchOverlay(projectBase){
       window.displayFilms(filtered, 'search-overlay-grid');
     } else {
       grid.innerHTML = filtered.map(f => {
-        const F = f.Film || {};
-        const title = (F.Title_English || F.Title_Original || 'Untitled').trim();
-        const folder = (f.Source_File || '').replace(/\.html$/i, '').toLowerCase();
-        const img = folder ? `images/stills/${folder}/${folder}_1.jpg` : '';
+        const title = f.title;
+        const img = f.still?.src || '';
         return `
-          <a class="preview-item-link" href="film_pages/${folder}.html">
+          <a class="preview-item-link" href="${escapeHtml(f.page)}">
             <div class="preview-item">
               <h3 class="film-card-title-meta">${escapeHtml(title)}</h3>
               <div class="news-item-image-wrapper">
@@ -273,3 +278,55 @@ function initSearchOverlay(projectBase){
 function debounce(fn, wait=150) {
   let t; return (...args) => { clearTimeout(t); t = setTimeout(() => fn(...args), wait); };
 }
+
+/* ===================== search index ===================== */
+// Prebuilt by the build (search_index.py): sorted folded tokens + per-token film ids.
+// foldText must fold exactly like search_index.fold().
+const EXTRA_FOLDS = { 'ł': 'l', 'đ': 'd', 'ø': 'o', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ı': 'i' };
+
+function foldText(s) {
+  return String(s ?? '').toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '')
+    .replace(/[łđøßæœı]/g, c => EXTRA_FOLDS[c]);
+}
+
+function tokenizeText(s) {
+  return foldText(s).match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+// Only a successful load is kept: after a failure the next call fetches again
+let SEARCH_INDEX_PROMISE = null;
+function loadSearchIndex(url = siteUrl('data/search_index.json')) {
+  if (!SEARCH_INDEX_PROMISE) {
+    SEARCH_INDEX_PROMISE = fetch(url)
+      .then(r => (r.ok ? r.json() : null))
+      .catch(() => null)
+      .then(index => {
+        if (!index) SEARCH_INDEX_PROMISE = null;
+        return index;
+      });
+  }
+  return SEARCH_INDEX_PROMISE;
+}
+
+// Ids of the films that contain, for every query token, a token starting with it (null for an empty query)
+function searchFilmIds(index, query) {
+  const terms = tokenizeText(query);
+  if (!terms.length) return null;
+
+  const { tokens, postings } = index;
+  let result = null;
+  for (const term of terms) {
+    let lo = 0, hi = tokens.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (tokens[mid] < term) lo = mid + 1; else hi = mid;
+    }
+    const ids = new Set();
+    for (let i = lo; i < tokens.length && tokens[i].startsWith(term); i++) {
+      postings[i].forEach(id => ids.add(id));
+    }
+    result = result ? new Set([...result].filter(id => ids.has(id))) : ids;
+    if (!result.size) break;
+  }
+  return result;
+}
@@ -1,10 +1,14 @@
 let allFilms = [];
 let filteredFilms = []; // This holds the currently displayed films
+let searchIndex = null; // data/search_index.json, see loadSearchIndex() in loadPartials.js
+let facets = null; // data/facets.json (facet_tables.py): per filter, its values and their sorted film ids
 
 document.addEventListener('DOMContentLoaded', () => {
     const isIndexPage = document.getElementById('topFilmsContainer') !== null;
     const isCataloguePage = document.getElementById('filmContainer') !== null;
 
+    // The index's top films are pre-rendered by the build (listing_pages.py), nothing to fetch
+    if (isIndexPage && !isCataloguePage && isPrerendered('topFilmsContainer')) return;
     fetchData(isIndexPage, isCataloguePage);
 
     if (isCataloguePage) {
@@ -22,8 +26,17 @@ document.addEventListener('DOMContentLoaded', () => {
 
 async function fetchData(isIndexPage, isCataloguePage) {
     try {
-        const response = await fetch('data/all_html_data.json');
+        // Slim catalogue index written by the build (catalogue_index.py): one flat entry per film
+        // with ranking, year, minutes and length already parsed
+        const [response, index, facetsResponse] = await Promise.all([
+            fetch('data/catalogue.json'),
+            isCataloguePage && typeof loadSearchIndex === 'function' ? loadSearchIndex() : null,
+            isCataloguePage ? fetch('data/facets.json') : null
+        ]);
         if (!response.ok) throw new Error(`HTTP error! Status: ${response.status}`);
+        if (facetsResponse && !facetsResponse.ok) throw new Error(`HTTP error! Status: ${facetsResponse.status}`);
+        searchIndex = index;
+        if (facetsResponse) facets = prepareFacets(await facetsResponse.json());
 
         allFilms = await response.json();
         // 🔴 DŮLEŽITÉ: vystav data globálně pro overlay v hlavičce
@@ -31,16 +44,12 @@ async function fetchData(isIndexPage, isCataloguePage) {
 
         console.log('All Films loaded:', allFilms);
 
-        allFilms.forEach(film => {
-            film.ParsedRanking = parseInt(film.Ranking, 10);
-            if (isNaN(film.ParsedRanking)) film.ParsedRanking = Infinity;
-        });
-
         if (isCataloguePage) {
             filteredFilms = [...allFilms];
             sortFilmsByRanking();
             populateAllFiltersInitial(); // This will now dynamically populate length
-            displayFilms(filteredFilms, 'filmContainer');
+            // The initial ranked grid is pre-rendered by the build; it is only redrawn once filtered
+            if (!isPrerendered('filmContainer')) displayFilms(filteredFilms, 'filmContainer');
         } else if (isIndexPage) {
             displayTopFilmsOnIndexPage();
         }
@@ -53,131 +62,112 @@ async function fetchData(isIndexPage, isCataloguePage) {
     }
 }
 
+// Whether the build pre-rendered the film cards of a grid (listing_pages.py)
+function isPrerendered(containerId) {
+    return document.getElementById(containerId)?.querySelector('.preview-item-link') != null;
+}
+
+// Unranked films (ranking null) go last
+const rankingOf = film => film.ranking ?? Infinity;
+
 function sortFilmsByRanking() {
-    filteredFilms.sort((a, b) => a.ParsedRanking - b.ParsedRanking);
+    filteredFilms.sort((a, b) => rankingOf(a) - rankingOf(b));
 }
 
 function displayTopFilmsOnIndexPage() {
     const top3Films = [...allFilms]
-        .sort((a, b) => a.ParsedRanking - b.ParsedRanking)
+        .sort((a, b) => rankingOf(a) - rankingOf(b))
         .slice(0, 3);
     displayFilms(top3Films, 'topFilmsContainer');
 }
 
-// ✅ FIXED version of getRoundedRuntime() - KEPT FOR FILTERING PURPOSES
-function getRoundedRuntime(runtimeString) {
-    if (!runtimeString || typeof runtimeString !== "string") return null;
-
-    // Clean the input
-    const cleanStr = runtimeString.trim().toLowerCase().replace(/[^0-9:]/g, '');
-
-    let totalMinutes = 0;
+// Catalogue filters: select id, key in getCurrentFilterValues() and data/facets.json, placeholder
+const FILTERS = [
+    { id: 'genresFilter', key: 'genre', placeholder: 'Genre' },
+    { id: 'yearFilter', key: 'year', placeholder: 'Year' },
+    { id: 'lengthFilter', key: 'length', placeholder: 'Length' },
+    { id: 'countryFilter', key: 'country', placeholder: 'Country' },
+    { id: 'ratingFilter', key: 'rating', placeholder: 'Rating' },
+    { id: 'audienceFilter', key: 'audience', placeholder: 'Audience' },
+    { id: 'keywordsFilter', key: 'keywords', placeholder: 'Themes' }
+];
+
+// Adds a lower-cased value -> position lookup to every facet of data/facets.json
+function prepareFacets(data) {
+    Object.values(data).forEach(facet => {
+        facet.lookup = new Map(facet.values.map((value, i) => [value.toLowerCase(), i]));
+    });
+    return data;
+}
 
-    // Handle formats like hh:mm:ss or mm:ss
-    const parts = cleanStr.split(':').map(Number);
+// Sorted film ids having value in a facet (values match case-insensitively)
+function facetIds(key, value) {
+    const facet = facets[key];
+    const position = facet ? facet.lookup.get(value.toLowerCase()) : undefined;
+    return position === undefined ? [] : facet.ids[position];
+}
 
-    if (parts.length === 3) {
-        const [hours, minutes, seconds] = parts;
-        totalMinutes = (hours || 0) * 60 + (minutes || 0) + (seconds || 0) / 60;
-    } else if (parts.length === 2) {
-        const [minutes, seconds] = parts;
-        totalMinutes = (minutes || 0) + (seconds || 0) / 60;
-    } else if (parts.length === 1 && cleanStr !== '') {
-        totalMinutes = parseInt(parts[0], 10);
-    } else {
-        return null;
+// Intersection of two sorted id lists
+function intersectIds(a, b) {
+    const result = [];
+    let i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] < b[j]) i++;
+        else if (a[i] > b[j]) j++;
+        else { result.push(a[i]); i++; j++; }
     }
-
-    if (isNaN(totalMinutes)) return null;
-
-    // Round totalMinutes to nearest whole number
-    totalMinutes = Math.round(totalMinutes);
-
-    if (totalMinutes < 40) return "short";
-    if (totalMinutes <= 70) return "mid-length";
-    return "full-length";
+    return result;
 }
 
-// ✨ NEW HELPER FUNCTION to get exact minutes for display
-function parseRuntimeToMinutes(runtimeString) {
-    if (!runtimeString || typeof runtimeString !== "string") return null;
-
-    const cleanStr = runtimeString.trim().toLowerCase().replace(/[^0-9:]/g, '');
-    let totalMinutes = 0;
-    const parts = cleanStr.split(':').map(Number);
-
-    if (parts.length === 3) {
-        const [hours, minutes, seconds] = parts;
-        totalMinutes = (hours || 0) * 60 + (minutes || 0) + (seconds || 0) / 60;
-    } else if (parts.length === 2) {
-        const [minutes, seconds] = parts;
-        totalMinutes = (minutes || 0) + (seconds || 0) / 60;
-    } else if (parts.length === 1 && cleanStr !== '') {
-        totalMinutes = parseInt(parts[0], 10);
-    } else {
-        return null;
+function countIntersection(a, b) {
+    let count = 0, i = 0, j = 0;
+    while (i < a.length && j < b.length) {
+        if (a[i] < b[j]) i++;
+        else if (a[i] > b[j]) j++;
+        else { count++; i++; j++; }
     }
-
-    if (isNaN(totalMinutes)) return null;
-    return Math.round(totalMinutes); // Round to nearest whole minute for display
+    return count;
 }
 
+// Sorted ids of the films matching the search box
+function searchIds(searchTerm) {
+    if (searchIndex) {
+        // Prebuilt index: accent-insensitive, also covers synopsis and keywords
+        const ids = searchFilmIds(searchIndex, searchTerm);
+        return ids ? Array.from(ids).sort((a, b) => a - b) : null;
+    }
+    return allFilms
+        .filter(film => [film.title, film.title_original, film.logline, film.director]
+            .some(text => text.toLowerCase().includes(searchTerm)))
+        .map(film => film.id);
+}
 
-function populateAllFiltersInitial() {
-    const genres = new Set();
-    const years = new Set();
-    const lengths = new Set(); // This will now collect actual lengths
-    const countries = new Set();
-    const ratings = new Set();
-    const audiences = new Set();
-    const keywords = new Set();
-
-    allFilms.forEach(film => {
-        const f = film.Film || {};
-        if (f.Genre_List) f.Genre_List.forEach(g => genres.add(g.trim()));
-        if (f.Date_of_completion) {
-            const yearMatch = f.Date_of_completion.match(/\b\d{4}\b/);
-            if (yearMatch) years.add(yearMatch[0]);
-        }
-        if (f.Runtime) {
-            // Still use getRoundedRuntime for filter population
-            const len = getRoundedRuntime(f.Runtime);
-            if (len) lengths.add(len);
-        }
-        if (f.Country_of_production) countries.add(f.Country_of_production.trim());
-        if (f.Target_Group?.Rating) ratings.add(f.Target_Group.Rating.trim());
-        if (f.Target_Group?.Audience) audiences.add(f.Target_Group.Audience.trim());
-        if (f.Keywords) {
-            f.Keywords.split(',').forEach(k => {
-                const trimmedKeyword = k.trim();
-                if (trimmedKeyword) {
-                    keywords.add(trimmedKeyword);
-                }
-            });
-        }
+// Sorted ids of the films matching the current search and filters (except the filter `exceptKey`),
+// or null when nothing restricts the list
+function matchingIds(values, exceptKey = null) {
+    let ids = values.searchTerm ? searchIds(values.searchTerm) : null;
+    FILTERS.forEach(filter => {
+        if (filter.key === exceptKey || !values[filter.key]) return;
+        const valueIds = facetIds(filter.key, values[filter.key]);
+        ids = ids ? intersectIds(ids, valueIds) : valueIds;
     });
+    return ids;
+}
 
-    populateSelect('genresFilter', Array.from(genres).sort(), '', 'Genre');
-    populateSelect('yearFilter', Array.from(years).sort((a, b) => b - a), '', 'Year');
-    // Dynamically sort lengths into the correct order if they exist
-    const sortedLengths = ['short', 'mid-length', 'full-length'].filter(cat => lengths.has(cat));
-    populateSelect('lengthFilter', sortedLengths, '', 'Length');
-    populateSelect('countryFilter', Array.from(countries).sort(), '', 'Country');
-    populateSelect('ratingFilter', Array.from(ratings).sort(), '', 'Rating');
-    populateSelect('audienceFilter', Array.from(audiences).sort(), '', 'Audience');
-    populateSelect('keywordsFilter', Array.from(keywords).sort(), '', 'Themes');
+function populateAllFiltersInitial() {
+    updateDependentFilterOptions(); // With nothing selected, every value shows its total count
 }
 
-function populateSelect(selectId, options, selectedValue = '', placeholder = 'Select') {
+function populateSelect(selectId, options, selectedValue = '', placeholder = 'Select', counts = null) {
     const selectElement = document.getElementById(selectId);
     if (!selectElement) return;
 
     selectElement.innerHTML = `<option value="" ${selectedValue === '' ? 'selected' : ''}>${placeholder}</option>`;
 
-    options.forEach(option => {
+    options.forEach((option, i) => {
         const opt = document.createElement('option');
         opt.value = option;
-        opt.textContent = option.charAt(0).toUpperCase() + option.slice(1);
+        opt.textContent = option.charAt(0).toUpperCase() + option.slice(1) + (counts ? ` (${counts[i]})` : '');
         if (option.toLowerCase() === selectedValue.toLowerCase() && selectedValue !== '') {
             opt.selected = true;
         }
@@ -186,36 +176,9 @@ function populateSelect(selectId, options, selectedValue = '', placeholder = 'Se
 }
 
 function applyFilters() {
-    const values = getCurrentFilterValues();
-
-    filteredFilms = allFilms.filter(film => {
-        const f = film.Film || {};
-        const crew = film.Crew || {};
-        const title = (f.Title_English || f.Title_Original || '').toLowerCase();
-        const originalTitle = (f.Title_Original || '').toLowerCase();
-        const logline = (film.Logline || '').toLowerCase();
-        const synopsis = (film.Synopsis || '').toLowerCase();
-        const director = (crew['Director(s)'] || '').toLowerCase();
-
-        const genres = f.Genre_List?.map(g => g.toLowerCase()) || [];
-        const runtimeCategory = f.Runtime ? getRoundedRuntime(f.Runtime) : null; // Use category for filtering
-        const year = f.Date_of_completion?.match(/\b\d{4}\b/)?.[0] || '';
-        const country = f.Country_of_production?.toLowerCase() || '';
-        const rating = f.Target_Group?.Rating?.toLowerCase() || '';
-        const audience = f.Target_Group?.Audience?.toLowerCase() || '';
-        const keywords = f.Keywords ? f.Keywords.split(',').map(k => k.trim().toLowerCase()) : [];
-
-        return (
-            (!values.searchTerm || title.includes(values.searchTerm) || originalTitle.includes(values.searchTerm) || logline.includes(values.searchTerm) || synopsis.includes(values.searchTerm) || director.includes(values.searchTerm)) &&
-            (!values.genre || genres.includes(values.genre)) &&
-            (!values.year || year === values.year) &&
-            (!values.length || runtimeCategory === values.length) && // Filter by category
-            (!values.country || country === values.country) &&
-            (!values.rating || rating === values.rating) &&
-            (!values.audience || audience === values.audience) &&
-            (!values.keywords || keywords.includes(values.keywords))
-        );
-    });
+    const ids = matchingIds(getCurrentFilterValues());
+    // Film ids are positions in allFilms
+    filteredFilms = ids ? ids.map(id => allFilms[id]) : [...allFilms];
 
     sortFilmsByRanking();
     displayFilms(filteredFilms, 'filmContainer');
@@ -235,59 +198,25 @@ function getCurrentFilterValues() {
     };
 }
 
+// Each filter offers the values that still have films given the search and the other filters,
+// with the number of those films
 function updateDependentFilterOptions() {
     const currentSelectedValues = getCurrentFilterValues();
 
-    const filtersConfig = [
-        { id: 'genresFilter', key: 'genre', path: f => f.Genre_List?.map(g => g.trim()), sort: arr => arr.sort(), placeholder: 'Genre' },
-        { id: 'yearFilter', key: 'year', path: f => f.Date_of_completion?.match(/\b\d{4}\b/)?.[0], sort: arr => arr.sort((a, b) => b - a), placeholder: 'Year' },
-        // IMPORTANT: The sort function for length here ensures the correct order
-        { id: 'lengthFilter', key: 'length', path: f => getRoundedRuntime(f.Runtime), sort: arr => ['short', 'mid-length', 'full-length'].filter(cat => arr.includes(cat)), placeholder: 'Length' },
-        { id: 'countryFilter', key: 'country', path: f => f.Country_of_production?.trim(), sort: arr => arr.sort(), placeholder: 'Country' },
-        { id: 'ratingFilter', key: 'rating', path: f => f.Target_Group?.Rating?.trim(), sort: arr => arr.sort(), placeholder: 'Rating' },
-        { id: 'audienceFilter', key: 'audience', path: f => f.Target_Group?.Audience?.trim(), sort: arr => arr.sort(), placeholder: 'Audience' },
-        {
-            id: 'keywordsFilter',
-            key: 'keywords',
-            path: f => f.Keywords?.split(',').map(k => k.trim()).filter(k => k),
-            sort: arr => arr.sort(),
-            placeholder: 'Themes'
-        }
-    ];
-
-    filtersConfig.forEach(filterConfig => {
-        const uniqueOptions = new Set();
-
-        const relevantFilmsForThisFilterPopulation = allFilms.filter(film => {
-            const f = film.Film || {};
-
-            return filtersConfig.every(otherFilterConfig => {
-                if (otherFilterConfig.id === filterConfig.id || !currentSelectedValues[otherFilterConfig.key]) {
-                    return true;
-                }
-
-                const selectedValueForOtherFilter = currentSelectedValues[otherFilterConfig.key];
-                const filmDataForOtherFilter = otherFilterConfig.path(f);
-
-                if (Array.isArray(filmDataForOtherFilter)) {
-                    return filmDataForOtherFilter.some(val => val?.toLowerCase() === selectedValueForOtherFilter.toLowerCase());
-                } else {
-                    return filmDataForOtherFilter?.toLowerCase() === selectedValueForOtherFilter.toLowerCase();
-                }
-            });
-        });
-
-        relevantFilmsForThisFilterPopulation.forEach(film => {
-            const values = filterConfig.path(film.Film || {});
-            if (Array.isArray(values)) {
-                values.forEach(v => v && uniqueOptions.add(v));
-            } else if (values) {
-                uniqueOptions.add(values);
+    FILTERS.forEach(filter => {
+        const facet = facets[filter.key];
+        if (!facet) return;
+        const others = matchingIds(currentSelectedValues, filter.key);
+        const options = [];
+        const counts = [];
+        facet.values.forEach((value, i) => {
+            const count = others ? countIntersection(facet.ids[i], others) : facet.ids[i].length;
+            if (count > 0) {
+                options.push(value);
+                counts.push(count);
             }
         });
-
-        const sortedOptions = filterConfig.sort(Array.from(uniqueOptions));
-        populateSelect(filterConfig.id, sortedOptions, currentSelectedValues[filterConfig.key], filterConfig.placeholder);
+        populateSelect(filter.id, options, currentSelectedValues[filter.key], filter.placeholder, counts);
     });
 }
 
@@ -301,41 +230,19 @@ function displayFilms(films, containerId = 'filmContainer') {
         return;
     }
 
-    films.forEach(filmData => {
-        const f = filmData.Film || {};
-        const crew = filmData.Crew || {};
-        const folder = filmData.Source_File?.replace(/\.html$/i, '').toLowerCase();
-
+    films.forEach(film => {
         const filmLink = document.createElement('a');
-        filmLink.href = `film_pages/${folder}.html`;
+        filmLink.href = film.page;
         filmLink.classList.add('preview-item-link');
 
         const filmCard = document.createElement('div');
         filmCard.classList.add('preview-item');
 
-        const title = (f.Title_English || f.Title_Original || 'Untitled').trim();
-        const year = f.Date_of_completion?.match(/\b\d{4}\b/)?.[0] || '';
-
-        // ✨ MODIFIED: Get and display exact minutes
-        const exactRuntimeMinutes = parseRuntimeToMinutes(f.Runtime);
-        let displayRuntime = '';
-        if (exactRuntimeMinutes !== null) {
-            displayRuntime = ` | ${exactRuntimeMinutes} min`;
-        } else {
-            // Fallback to category if exact minutes can't be parsed, or show nothing
-            const runtimeCategory = f.Runtime ? getRoundedRuntime(f.Runtime) : null;
-            if (runtimeCategory === 'short') {
-                displayRuntime = ' (<40 min)';
-            } else if (runtimeCategory === 'mid-length') {
-                displayRuntime = ' (40-70 min)';
-            } else if (runtimeCategory === 'full-length') {
-                displayRuntime = ' (>70 min)';
-            }
-            // If you truly only want exact minutes, you could just leave displayRuntime empty here.
-        }
-
-        const director = (crew['Director(s)'] || 'Unknown Director').trim();
-        const logline = (filmData.Logline || '').trim();
+        const title = film.title;
+        const year = film.year || '';
+        const displayRuntime = film.minutes !== null ? ` | ${film.minutes} min` : '';
+        const director = film.director || 'Unknown Director';
+        const logline = film.logline;
 
         const titleMeta = document.createElement('h3');
         titleMeta.classList.add('film-card-title-meta');
@@ -350,7 +257,24 @@ function displayFilms(films, containerId = 'filmContainer') {
         const imageWrapper = document.createElement('div');
         imageWrapper.classList.add('news-item-image-wrapper');
         const img = document.createElement('img');
-        img.src = folder ? `images/stills/${folder}/${folder}_1.jpg` : '';
+        // First still as recorded by the build (asset_index.py): src, width/height, dominant color, blurred placeholder
+        const still = film.still;
+        const stillSrc = still?.src || '';
+        img.src = stillSrc;
+        if (still?.width) {
+            img.width = still.width;
+            img.height = still.height;
+        }
+        if (still?.placeholder) {
+            imageWrapper.style.background = `${still.color} url("${still.placeholder}") center/cover no-repeat`;
+        }
+        if (still?.srcset) {
+            // Resized copies written by the build, at their real widths (image_derivatives.jpeg_srcset);
+            // fall back to the original if one is missing
+            img.srcset = still.srcset;
+            img.sizes = '(max-width: 768px) 100vw, 350px';
+            img.onerror = () => { img.onerror = null; img.removeAttribute('srcset'); };
+        }
         img.alt = `Still from ${title}`;
         imageWrapper.appendChild(img);
         filmCard.appendChild(imageWrapper);
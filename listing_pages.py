@@ -0,0 +1,69 @@
+import html
+
+import page_templates
+
+# ---------------------- Configuration ----------------------
+# The film grids of the hand-written listing pages are pre-rendered at build time, so they
+# show before (and without) js/script.js fetching data/catalogue.json. Each grid is written
+# between <!-- grid:ID --> and <!-- /grid:ID --> inside its container; the cards are the
+# same markup displayFilms() in js/script.js builds, which keeps the grid up to date
+# when the catalogue is filtered.
+CATALOGUE_PAGE = 'catalogue.html'
+INDEX_PAGE = 'index.html'
+TOP_FILMS_COUNT = 3
+STILL_SIZES = '(max-width: 768px) 100vw, 350px'
+# Restores the original still if a resized copy is missing (as displayFilms does)
+STILL_ONERROR = "this.onerror=null;this.removeAttribute('srcset')"
+
+
+# ---------------------- Helper Functions ----------------------
+
+def ranked(entries):
+    """Catalogue entries by ranking, unranked last (sortFilmsByRanking in js/script.js)."""
+    return sorted(entries, key=lambda e: e['ranking'] if e['ranking'] is not None else float('inf'))
+
+
+def still_html(entry):
+    """The card's image wrapper: first still with size, placeholder background and resized copies."""
+    still = entry['still'] or {}
+    src = still.get('src') or ''
+    wrapper_attributes = ''
+    if still.get('placeholder'):
+        background = f'{still["color"]} url("{still["placeholder"]}") center/cover no-repeat'
+        wrapper_attributes = f' style="background: {html.escape(background)};"'
+    img_attributes = f'src="{html.escape(src)}"'
+    if still.get('width'):
+        img_attributes += f' width="{still["width"]}" height="{still["height"]}"'
+    if still.get('srcset'):  # the recorded derivatives (image_derivatives.jpeg_srcset), as the film pages list them
+        img_attributes += (f' srcset="{html.escape(still["srcset"])}" sizes="{STILL_SIZES}"'
+                           f' onerror="{STILL_ONERROR}"')
+    img_attributes += f' alt="{html.escape("Still from " + entry["title"])}"'
+    return f'<div class="news-item-image-wrapper"{wrapper_attributes}><img {img_attributes}></div>'
+
+
+def film_card_html(entry):
+    """One film card, as displayFilms() in js/script.js renders it."""
+    title_meta = entry['title']
+    if entry['year']:
+        title_meta += f" | {entry['year']}"
+    if entry['minutes'] is not None:
+        title_meta += f" | {entry['minutes']} min"
+    return (f'<a href="{html.escape(entry["page"])}" class="preview-item-link"><div class="preview-item">'
+            f'<h3 class="film-card-title-meta">{html.escape(title_meta, quote=False)}</h3>'
+            f'<p class="film-card-director">by {html.escape(entry["director"] or "Unknown Director", quote=False)}</p>'
+            f'{still_html(entry)}'
+            f'<p class="news-item-description">{html.escape(entry["logline"], quote=False)}</p>'
+            f'</div></a>')
+
+
+def prerender_listings(entries, catalogue_page=CATALOGUE_PAGE, index_page=INDEX_PAGE):
+    """
+    Build stage: writes the ranked catalogue grid into catalogue.html and the top films
+    into index.html, from the catalogue entries (catalogue_index.build_catalogue).
+    """
+    films = ranked(entries)
+    changed = [path for path, container_id, grid in [
+        (catalogue_page, 'filmContainer', films),
+        (index_page, 'topFilmsContainer', films[:TOP_FILMS_COUNT]),
+    ] if page_templates.update_page(path, {f'grid:{container_id}': [film_card_html(entry) for entry in grid]})]
+    print(f"✅ Film grids pre-rendered ({len(changed)} listing page(s) updated).")
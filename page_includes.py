@@ -0,0 +1,32 @@
+import os
+
+import page_templates
+
+# ---------------------- Configuration ----------------------
+# The header and footer partials are inlined into the top-level pages at build time, so
+# js/loadPartials.js no longer has to fetch them (probing several folders) before the header
+# shows. A page gets a partial between <!-- include:NAME --> and <!-- /include:NAME --> inside
+# its #header-container / #footer-container; pages without the markers keep loading it at runtime.
+INCLUDES_DIR = 'includes'
+PARTIALS = ['header.html', 'footer.html']
+PAGES_DIR = '.'
+
+
+# ---------------------- Helper Functions ----------------------
+
+def read_partial(name, includes_dir=INCLUDES_DIR):
+    """The lines of a partial, without trailing blank lines."""
+    with open(os.path.join(includes_dir, name), 'r', encoding='utf-8') as f:
+        return [line.rstrip() for line in f.read().rstrip().splitlines()]
+
+
+def top_level_pages(pages_dir=PAGES_DIR):
+    """The .html pages directly in pages_dir."""
+    return sorted(os.path.join(pages_dir, name) for name in os.listdir(pages_dir) if name.endswith('.html'))
+
+
+def inline_partials(pages_dir=PAGES_DIR, includes_dir=INCLUDES_DIR):
+    """Build stage: inlines the current header and footer into every top-level page that has the markers."""
+    regions = {f'include:{name}': read_partial(name, includes_dir) for name in PARTIALS}
+    changed = [path for path in top_level_pages(pages_dir) if page_templates.update_page(path, regions)]
+    print(f"✅ Header and footer inlined ({len(changed)} page(s) updated).")
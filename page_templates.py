@@ -0,0 +1,103 @@
+import os
+import re
+
+import build_trace
+
+# ---------------------- Configuration ----------------------
+# Build-time HTML templates live in templates/ as plain HTML with {{ name }} slots,
+# so CSS and JS braces need no escaping. A template is compiled once into a tuple of
+# literal chunks and slot names, cached, and rendered by joining one list of strings.
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+SLOT_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+# The hand-written top-level pages (index.html, catalogue.html, ...) are not templates; the
+# build fills named regions of them in place, between <!-- name --> and <!-- /name --> lines.
+
+_compiled_cache = {}  # template path -> (mtime_ns, compiled template)
+
+
+# ---------------------- Helper Functions ----------------------
+
+def template_path(name):
+    """Returns the path of a template file by name, e.g. 'film_page.html'."""
+    return os.path.join(TEMPLATE_DIR, name)
+
+
+def compile_template(text):
+    """
+    Compiles template text into a tuple alternating literal chunks and slot names:
+    (literal, slot, literal, slot, ..., literal). Literals sit at the even indexes.
+    """
+    return tuple(SLOT_PATTERN.split(text))
+
+
+def load_template(name):
+    """
+    Returns the compiled template, compiling it only on first use or after the
+    file changed on disk.
+    """
+    path = template_path(name)
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _compiled_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    # newline='' keeps the file's line endings byte for byte
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        compiled = compile_template(f.read())
+    _compiled_cache[path] = (mtime_ns, compiled)
+    return compiled
+
+
+def render(compiled, values):
+    """
+    Fills a compiled template. Every slot must have a value; values are converted with str().
+    Raises KeyError naming the first missing slot.
+    """
+    chunks = list(compiled)
+    for i in range(1, len(chunks), 2):
+        chunks[i] = str(values[chunks[i]])
+    return ''.join(chunks)
+
+
+def render_template(name, **values):
+    """Loads (from cache) and renders the named template."""
+    return render(load_template(name), values)
+
+
+def fill_region(text, name, lines):
+    """
+    Replaces the content between the <!-- name --> and <!-- /name --> markers with lines,
+    each indented like the opening marker. Returns text unchanged if it has no such region.
+    """
+    pattern = re.compile(rf'([ \t]*)<!-- {re.escape(name)} -->.*?<!-- /{re.escape(name)} -->', re.DOTALL)
+
+    def fill(match):
+        indent = match.group(1)
+        newline = '\r\n' if '\r\n' in text else '\n'
+        filled = [f'{indent}<!-- {name} -->', *[f'{indent}{line}' if line else '' for line in lines],
+                  f'{indent}<!-- /{name} -->']
+        return newline.join(filled)
+
+    return pattern.sub(fill, text, count=1)
+
+
+def update_page(path, regions):
+    """
+    Fills the named regions ({name: lines}) of a hand-written page in place.
+    Regions the page has no markers for are skipped. Returns True if the file changed.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+    except FileNotFoundError:
+        print(f"⚠️ {path} not found, not updated.")
+        return False
+    new_text = text
+    for name, lines in regions.items():
+        new_text = fill_region(new_text, name, lines)
+    if new_text == text:
+        return False
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(new_text)
+    build_trace.file_written(path)
+    return True
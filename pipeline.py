@@ -0,0 +1,152 @@
+import os
+
+import asset_index
+import build_manifest
+import build_trace
+import exporters
+import catalogue_index
+import facet_tables
+import film_store
+import generate_pages
+import image_derivatives
+import image_optimizer
+import join_data
+import listing_pages
+import page_includes
+import precompress
+import search_index
+import questionare_info
+
+# ---------------------- Configuration ----------------------
+QUESTIONNAIRE_DIR = 'questionare'
+DATA_DIR = 'data'
+
+
+def extract(questionnaire_dir=QUESTIONNAIRE_DIR, data_dir=DATA_DIR, manifest=None, incremental=False, jobs=1,
+            html_parser='auto', exports=exporters.DEFAULT_EXPORTS):
+    """
+    Stage 1: extracts every questionnaire and writes the raw records to the spreadsheet
+    exports (exporters.py; none if exports is empty). Returns the raw records.
+    """
+    if not os.path.isdir(questionnaire_dir):
+        print(f"Error: Folder '{questionnaire_dir}' not found.")
+        return []
+
+    os.makedirs(data_dir, exist_ok=True)
+    records, changed = questionare_info.extract_questionnaires(questionnaire_dir, manifest, incremental, jobs,
+                                                                  html_parser)
+
+    if not records:
+        print("No HTML files processed or no data extracted.")
+    else:
+        questionare_info.export_records(records, data_dir, exports, incremental and not changed)
+    return records
+
+
+def merge(records, aditional_info_path=join_data.ADITIONAL_INFO_PATH, conflict_policy='sidecar'):
+    """Stage 2: merges the side-car info into the raw records and prints the merge report. Returns the merged records."""
+    films, report = join_data.merge_aditional_info(records, join_data.load_aditional_info(aditional_info_path),
+                                                   conflict_policy)
+    join_data.print_merge_report(report, conflict_policy)
+    return films
+
+
+def images(manifest, jobs=1, optimize_images=False):
+    """
+    Stage 3: scans images/ into the asset index, optionally optimises the poster and still
+    originals losslessly, in place, then writes resized derivatives of new or changed ones.
+    Returns the asset index.
+    """
+    index = asset_index.build_index(manifest)
+    if optimize_images and image_optimizer.optimize_images(manifest, jobs, index=index):
+        index = asset_index.build_index(manifest)  # rewritten files changed size
+    image_derivatives.build_derivatives(manifest, index)
+    return index
+
+
+def with_image_info(films, index, derivatives=None):
+    """
+    Returns the films with an 'Images' entry (poster and stills with their dimensions and
+    placeholders, see asset_index.film_images), so the front end can size and pre-fill its cards.
+    With the manifest's derivatives section, every image also gets the srcset of the resized
+    JPEGs actually written for it (image_derivatives.jpeg_srcset), so no width is advertised
+    that the source is too small for.
+    """
+    derivatives = derivatives or {}
+    films = [dict(film, Images=asset_index.film_images(index, generate_pages.film_page_slug(film)))
+             for film in films]
+    for film in films:
+        for image in [film['Images']['Poster'], *film['Images']['Stills']]:
+            if image:
+                image['srcset'] = image_derivatives.jpeg_srcset(derivatives.get(image['src']))
+    return films
+
+
+def render(films, output_dir=generate_pages.OUTPUT_DIR, manifest=None, incremental=False, index=None):
+    """Stage 4: renders the film pages. Returns the number of pages written."""
+    return generate_pages.generate_pages(films, output_dir, manifest, incremental, index)
+
+
+def write_indexes(films, data_dir=DATA_DIR, store='json'):
+    """
+    Writes the merged records and everything derived from them for the front end:
+    catalogue, facet tables, search index, pre-rendered listing grids and inlined partials.
+    With store='jsonl' the records are also synced into the JSON-Lines store for the
+    standalone scripts (see film_store.py); the build itself never reads it back.
+    """
+    join_data.save_merged_data(films, os.path.join(data_dir, "all_html_data.json"))
+    catalogue = catalogue_index.build_catalogue(films)
+    catalogue_index.save_catalogue(catalogue, os.path.join(data_dir, "catalogue.json"))
+    facet_tables.save_facets(facet_tables.build_facets(catalogue), os.path.join(data_dir, "facets.json"))
+    listing_pages.prerender_listings(catalogue)
+    page_includes.inline_partials()
+    search_index.save_search_index(search_index.build_search_index(films), os.path.join(data_dir, "search_index.json"))
+    if store == 'jsonl':
+        jsonl_path = os.path.join(data_dir, "all_html_data.jsonl")
+        appended, deleted = film_store.sync_records(films, jsonl_path)
+        print(f"✅ {jsonl_path}: {appended} film(s) written, {deleted} removed")
+
+
+def build(questionnaire_dir=QUESTIONNAIRE_DIR, data_dir=DATA_DIR, incremental=False, jobs=1, html_parser='auto',
+          conflict_policy='sidecar', store='json', optimize_images=False, compress=True,
+          report_path=build_trace.REPORT_PATH, chrome_trace_path=None, trace_memory=False,
+          exports=exporters.DEFAULT_EXPORTS):
+    """
+    Runs extract -> merge -> images -> render in one process, handing records over in memory.
+    The raw records are exported in the exports spreadsheet formats (exporters.py).
+    The merged records (with their image info) are written to data/all_html_data.json once,
+    and the slim catalogue, search index and filter facet tables the front end reads to
+    data/catalogue.json, data/search_index.json and data/facets.json (film ids in all
+    three are positions in the merged list); the ranked film grids of catalogue.html and
+    index.html are pre-rendered from the same catalogue, and the header/footer partials are
+    inlined into the top-level pages.
+    With store='jsonl' they are also synced into the JSON-Lines store (film_store),
+    which only appends the films that changed.
+    With compress, every served text file finally gets .gz/.br siblings (precompress).
+    Every stage is instrumented (build_trace): the build report is written to report_path,
+    a Chrome trace to chrome_trace_path if given; trace_memory adds tracemalloc peaks (slower).
+    Returns the merged film records.
+    """
+    build_trace.start_trace(trace_memory)
+    manifest = build_manifest.load_manifest()
+
+    with build_trace.stage('extract'):
+        records = extract(questionnaire_dir, data_dir, manifest, incremental, jobs, html_parser, exports)
+    with build_trace.stage('merge'):
+        films = merge(records, conflict_policy=conflict_policy)
+    with build_trace.stage('images'):
+        index = images(manifest, jobs, optimize_images)
+        films = with_image_info(films, index, manifest['derivatives'])
+    with build_trace.stage('indexes'):
+        if films:
+            write_indexes(films, data_dir, store)
+    with build_trace.stage('render'):
+        render(films, manifest=manifest, incremental=incremental, index=index)
+    if compress:
+        with build_trace.stage('compress'):
+            precompress.precompress(manifest)
+
+    build_manifest.save_manifest(manifest)
+    build_trace.finish_trace(report_path, chrome_trace_path)
+    return films
+
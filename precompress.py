@@ -0,0 +1,145 @@
+import os
+import gzip
+
+import build_manifest
+import build_trace
+
+try:
+    import brotli  # optional: pip install brotli
+except ImportError:
+    brotli = None
+
+# ---------------------- Configuration ----------------------
+# Every text file the site serves gets .gz (and, with the brotli package installed, .br)
+# siblings at maximum compression, so the web server can send them as they are
+# (e.g. nginx gzip_static / brotli_static) instead of compressing per request.
+# Only files whose content changed since the last build are recompressed.
+SERVED_DIRS = ['.', 'film_pages', 'css', 'js', 'data', 'includes', 'images/logo']
+TEXT_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg')
+EXCLUDED_FILES = {os.path.normpath(build_manifest.MANIFEST_PATH), os.path.normpath(build_trace.REPORT_PATH)}
+ENCODINGS = ['gz', 'br']
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+# ---------------------- Helper Functions ----------------------
+
+def available_encodings():
+    """The sibling formats this environment can write: 'gz' always, 'br' with the brotli package."""
+    return ENCODINGS if brotli else ['gz']
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)  # mtime=0: same input, same bytes
+
+
+def iter_text_files(dirs=SERVED_DIRS):
+    """Paths of the served text files (not recursive: every served folder is flat)."""
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+            path = os.path.normpath(entry.path)
+            if entry.is_file() and entry.name.endswith(TEXT_EXTENSIONS) and path not in EXCLUDED_FILES:
+                yield path
+
+
+def compress_file(path, encodings):
+    """
+    Writes path.gz / path.br. A sibling that would not be smaller than the file is not
+    written (and an old one removed), nor are formats not in encodings.
+    Returns {encoding: compressed size or None}.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    for encoding in set(ENCODINGS) - set(encodings):
+        if os.path.exists(f"{path}.{encoding}"):
+            os.remove(f"{path}.{encoding}")
+    sizes = {}
+    for encoding in encodings:
+        compressed = compress(data, encoding)
+        sibling = f"{path}.{encoding}"
+        if len(compressed) < len(data):
+            tmp_path = f"{sibling}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, sibling)
+            build_trace.file_written(sibling)
+            sizes[encoding] = len(compressed)
+        else:
+            if os.path.exists(sibling):
+                os.remove(sibling)
+            sizes[encoding] = None
+    return sizes
+
+
+def is_current(entry, digest, encodings, path):
+    """Whether the recorded siblings of path are still those of its current content."""
+    return (entry is not None and entry['sha256'] == digest and sorted(entry['sizes']) == sorted(encodings)
+            and all(size is None or os.path.exists(f"{path}.{enc}") for enc, size in entry['sizes'].items()))
+
+
+def remove_orphans(dirs, sources):
+    """Removes .gz/.br files whose source is gone (e.g. a replaced fingerprinted asset)."""
+    removed = 0
+    for directory in dirs:
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            stem, extension = os.path.splitext(os.path.normpath(entry.path))
+            if extension[1:] in ENCODINGS and stem.endswith(TEXT_EXTENSIONS) and stem not in sources:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+def size_report(manifest, paths, encodings):
+    """Prints original and compressed sizes per folder."""
+    totals = {}
+    for path in paths:
+        row = totals.setdefault(os.path.dirname(path) or '.', {'files': 0, 'size': 0, **{e: 0 for e in encodings}})
+        size = os.path.getsize(path)
+        row['files'] += 1
+        row['size'] += size
+        for encoding in encodings:
+            row[encoding] += manifest['compressed'][path]['sizes'][encoding] or size
+    grand = {'files': 0, 'size': 0, **{e: 0 for e in encodings}}
+    print(f"{'folder':<14}{'files':>6}{'original':>12}" + "".join(f"{'.' + e:>12}" for e in encodings))
+    for folder, row in sorted(totals.items()):
+        for key in grand:
+            grand[key] += row[key]
+        print(f"{folder:<14}{row['files']:>6}{row['size'] / 1024:>10.1f}KB"
+              + "".join(f"{row[e] / 1024:>10.1f}KB" for e in encodings))
+    print(f"{'total':<14}{grand['files']:>6}{grand['size'] / 1024:>10.1f}KB"
+          + "".join(f"{grand[e] / 1024:>7.1f}KB{100 * grand[e] // max(grand['size'], 1):>3}%" for e in encodings))
+
+
+def precompress(manifest, dirs=SERVED_DIRS, report=True):
+    """
+    Build stage: (re)writes the compressed siblings of every served text file whose content
+    changed, tracked in the manifest's 'compressed' section (path -> {'sha256', 'sizes'}).
+    Returns the number of files compressed.
+    """
+    encodings = available_encodings()
+    known = manifest.setdefault('compressed', {})
+    paths = list(iter_text_files(dirs))
+    current = {}
+    compressed = 0
+    for path in paths:
+        digest = build_manifest.file_digest(manifest, path)
+        entry = known.get(path)
+        if not is_current(entry, digest, encodings, path):
+            entry = {'sha256': digest, 'sizes': compress_file(path, encodings)}
+            compressed += 1
+        current[path] = entry
+    manifest['compressed'] = current
+    removed = remove_orphans(dirs, set(paths))
+
+    print(f"✅ Precompressed {compressed} file(s) as {'/'.join('.' + e for e in encodings)} "
+          f"({len(paths) - compressed} unchanged, {removed} stale removed)"
+          f"{'' if brotli else ' ⚠️ brotli not installed: no .br files'}.")
+    if report:
+        size_report(manifest, paths, encodings)
+    return compressed
@@ -0,0 +1,426 @@
+from bs4.element import NavigableString, Tag
+
+# The questionnaire form, described declaratively. Every field names an anchor
+# (a <label>/<h2> by its text, a text node, a textarea placeholder or an element id),
+# the steps that lead from the anchor to the element holding the value, and how the
+# value is read. compile_schema() turns this into an extraction plan once; the plan
+# indexes all anchors in a single pass over each form, so adding a field never adds
+# another scan of the document.
+#
+# Anchors:  ('label', text) | ('h2', text) | ('string', text) | ('placeholder', text) | ('id', id)
+# Steps:    ('sibling', tag, n)       n-th following sibling <tag> (n defaults to 0)
+#           ('next', tag)             next <tag> in document order
+#           ('p_block', text, match)  following sibling <p> whose text starts with / contains text,
+#                                     stopping at the next <label> or <h2>
+#           ('string_p', text)        following sibling <p> whose own string contains text
+#           ('child', tag)            first descendant <tag>
+# Values:   'text' | 'selected' | 'selected_list' | 'lines' | 'address'
+
+ADDRESS_KEYS = ["Name", "Address", "Postal code, city", "Country", "WEB"]
+
+
+# ---------------------- Schema building blocks ----------------------
+
+def field(key, anchor, *steps, value='text', max_length=None):
+    """A single value read from the element reached from anchor via steps."""
+    return {'kind': 'field', 'key': key, 'anchor': anchor, 'steps': steps, 'value': value,
+            'max_length': max_length}
+
+
+def group(key, children, gate=None, if_missing='empty'):
+    """
+    A nested object. If gate is given and not found in the form, the object is
+    either left out of the record (if_missing='omit') or empty (if_missing='empty').
+    """
+    return {'kind': 'group', 'key': key, 'children': children, 'gate': gate, 'if_missing': if_missing}
+
+
+def rows(key, container_id, columns, gate):
+    """A list of objects, one per <div class="row"> inside the container, columns read by textarea class."""
+    return {'kind': 'rows', 'key': key, 'container': ('id', container_id), 'columns': columns, 'gate': gate}
+
+
+def label_sequence(key, gate, labels):
+    """
+    An object read from consecutive <label>/<textarea> pairs following gate, where each
+    label is searched for after the previously found one (the crew list).
+    """
+    return {'kind': 'label_sequence', 'key': key, 'gate': gate, 'labels': labels}
+
+
+def selected_after(key, label, n=0):
+    return field(key, ('label', label), ('sibling', 'select', n), value='selected')
+
+
+def textarea_after(key, label, **options):
+    return field(key, ('label', label), ('sibling', 'textarea'), **options)
+
+
+# ---------------------- Questionnaire schema ----------------------
+
+QUESTIONNAIRE_SCHEMA = [
+    group('Film', gate=('h2', '1. Film'), if_missing='omit', children=[
+        field('Title_Original', ('label', 'Title'), ('sibling', 'textarea', 0)),
+        field('Title_English', ('label', 'Title'), ('sibling', 'textarea', 1)),
+        field('Title_Other', ('label', 'Title'), ('sibling', 'textarea', 2)),
+        field('Language_Original', ('label', 'Language'), ('sibling', 'textarea', 0)),
+        field('Language_Subtitles', ('label', 'Language'), ('sibling', 'textarea', 1)),
+        textarea_after('Country_of_production', 'Country of production'),
+        textarea_after('Date_of_completion', 'Date of completion'),
+        textarea_after('Runtime', 'Runtime (for the series average value)'),
+        field('Number_of_series', ('string', 'Number of series:'), ('sibling', 'textarea')),
+        field('Number_of_episodes', ('string', 'Number of episodes:'), ('sibling', 'textarea')),
+        field('Titles_and_runtime_of_episodes', ('placeholder', 'S1E1: Name of episode (running time)')),
+        selected_after('First_Film', 'First film?'),
+        field('Genre_List', ('id', 'genre-container'), value='selected_list'),
+        field('Genre_Other', ('id', 'genre-container'), ('p_block', 'Other:', 'startswith'), ('child', 'textarea')),
+        textarea_after('Keywords', 'Keywords (story topics)'),
+        group('Target_Group', gate=('label', 'Target group'), if_missing='omit', children=[
+            selected_after('Rating', 'Target group', 0),
+            selected_after('Audience', 'Target group', 1),
+            field('Other', ('label', 'Target group'), ('sibling', 'select', 1), ('string_p', 'Other:'),
+                  ('child', 'textarea')),
+        ]),
+    ]),
+    rows('Premiere', 'premiere-container', gate=('h2', '2. Premiere'), columns=[
+        ('Date', 'date'), ('Country', 'country'), ('Name_of_place_of_premiere', 'festival')]),
+    rows('Festivals', 'festival-container', gate=('h2', '3. Festivals'), columns=[
+        ('Date', 'date'), ('Country', 'country'), ('Name_of_Festival', 'festival')]),
+    rows('Awards', 'awards-container', gate=('h2', '4. Awards'), columns=[
+        ('Date', 'date'), ('Country', 'country'), ('Festival_Section_of_Competition', 'festival')]),
+    field('Logline', ('h2', '5. Logline (max. 150 characters)'), ('sibling', 'textarea'), max_length=150),
+    field('Synopsis', ('h2', '6. Synopsis (max. 350 characters)'), ('sibling', 'textarea'), max_length=350),
+    field('Directors_Note', ('h2', "7. Director's note (max. 500 characters)"), ('sibling', 'textarea'),
+          max_length=500),
+    label_sequence('Crew', gate=('h2', '8. Crew'), labels=[
+        ("Director(s):", "Director(s)", 'text'),
+        ("Screenplay writer(s):", "Screenplay_writer(s)", 'text'),
+        ("Director(s) of Photography:", "Director(s)_of_Photography", 'text'),
+        ("Editor(s):", "Editor(s)", 'text'),
+        ("Sound director(s):", "Sound_director(s)", 'text'),
+        ("Art director(s):", "Art_director(s)", 'text'),
+        ("Music composer(s):", "Music_composer(s)", 'text'),
+        ("Cast (actor's name: role):", "Cast", 'lines'),
+    ]),
+    group('Director_Bio', children=[
+        textarea_after('Date_of_birth', 'Date of birth:'),
+        textarea_after('Bio_Text', 'Max. 500 characters:', max_length=500),
+    ]),
+    field('Director_Filmography', ('h2', "10. Director's filmography"), ('sibling', 'textarea'), value='lines'),
+    group('Technical_Details', gate=('h2', '11. Technical details'), children=[
+        group('Shooting_Format', children=[
+            selected_after('Film', 'Shooting format', 0),
+            selected_after('Video', 'Shooting format', 1),
+            textarea_after('Other', 'Shooting format'),
+        ]),
+        textarea_after('Camera', 'Camera:'),
+        selected_after('Anamorphic_Lens', 'Anamorphic lens:'),
+        selected_after('Animation_Technique', 'Animation technique'),
+        field('Animation_Technique_Other', ('label', 'Animation technique'), ('next', 'textarea')),
+        textarea_after('Video_Editing_Software', 'Video editing software'),
+        textarea_after('Digital_Audio_Workstation', 'Digital audio workstation'),
+        group('Screening_Format', children=[
+            selected_after('Film', 'Screening format', 0),
+            selected_after('Tape', 'Screening format', 1),
+            selected_after('File', 'Screening format', 2),
+            textarea_after('Other', 'Screening format'),
+        ]),
+        selected_after('Resolution', 'Resolution'),
+        field('Resolution_Other', ('label', 'Resolution'), ('next', 'textarea')),
+        group('Speed', children=[
+            selected_after('Scan_Method', 'Speed'),
+            field('FPS', ('label', 'Speed'), ('sibling', 'select'),
+                  ('p_block', 'FPS (frame per second):', 'contains'), ('child', 'select'), value='selected'),
+            field('FPS_Other', ('label', 'Speed'), ('sibling', 'select'),
+                  ('p_block', 'FPS (frame per second):', 'contains'), ('p_block', 'Other:', 'startswith'),
+                  ('child', 'textarea')),
+        ]),
+        selected_after('Aspect_Ratio', 'Aspect ratio'),
+        field('Aspect_Ratio_Other', ('label', 'Aspect ratio'), ('next', 'textarea')),
+        selected_after('Sound_Mix', 'Sound mix'),
+        field('Sound_Mix_Other', ('label', 'Sound mix'), ('next', 'textarea')),
+        selected_after('Colour', 'Colour'),
+        textarea_after('Notes', 'Notes'),
+    ]),
+    group('Production', gate=('h2', '12. Production'), children=[
+        textarea_after('Producers', 'Producers:', value='address'),
+        textarea_after('Production_Company', 'Production company:', value='address'),
+        textarea_after('Co_Producer', 'Co-producer:', value='address'),
+    ]),
+]
+
+
+# ---------------------- Value readers ----------------------
+
+def parse_address_block(textarea_element):
+    """Parses a multi-line 'Key: value' address block into a dict with all ADDRESS_KEYS present."""
+    block_data = {}
+    if textarea_element:
+        lines = [line.strip() for line in textarea_element.get_text(strip=False).split('\n') if line.strip()]
+        for line in lines:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                block_data[key.strip()] = value.strip()
+            else:
+                # If a line doesn't have a colon, treat it as part of the 'Name' if 'Name' isn't already set
+                # This handles cases like "Name:\nValue" vs just "Value" for Name
+                if not block_data.get('Name'):
+                    block_data['Name'] = line.strip()
+                else:  # Append to name if it's already there and no colon
+                    block_data['Name'] += f" {line.strip()}"
+
+    # Ensure all expected keys are present, even if empty, for consistent Excel columns
+    for key in ADDRESS_KEYS:
+        if key not in block_data:
+            block_data[key] = ""
+    return block_data
+
+
+def read_selected(select):
+    selected_option = select.find('option', selected=True)
+    return selected_option.get_text(strip=True) if selected_option else ""
+
+
+def read_selected_list(container):
+    selected = []
+    for select_tag in container.find_all('select'):
+        text = read_selected(select_tag)
+        if text:
+            selected.append(text)
+    return selected
+
+
+def read_lines(element):
+    return [item.strip() for item in element.get_text(strip=True).split('\n') if item.strip()]
+
+
+VALUE_READERS = {
+    'text': lambda element: element.get_text(strip=True),
+    'selected': read_selected,
+    'selected_list': read_selected_list,
+    'lines': read_lines,
+    'address': parse_address_block,
+}
+
+VALUE_DEFAULTS = {
+    'text': lambda: "",
+    'selected': lambda: "",
+    'selected_list': list,
+    'lines': list,
+    'address': lambda: parse_address_block(None),
+}
+
+
+# ---------------------- Navigation steps ----------------------
+
+def step_sibling(element, tag, n=0):
+    siblings = element.find_next_siblings(tag, limit=n + 1)
+    return siblings[n] if len(siblings) > n else None
+
+
+def step_next(element, tag):
+    return element.find_next(tag)
+
+
+def step_p_block(element, text, match):
+    current_sibling = element.next_sibling
+    while current_sibling:
+        if isinstance(current_sibling, Tag):
+            if current_sibling.name == 'p':
+                p_text = current_sibling.get_text(strip=True)
+                if p_text.startswith(text) if match == 'startswith' else text in p_text:
+                    return current_sibling
+            # Stop if we hit a new major section to avoid false positives
+            if current_sibling.name in ['label', 'h2']:
+                return None
+        current_sibling = current_sibling.next_sibling
+    return None
+
+
+def step_string_p(element, text):
+    return element.find_next_sibling('p', string=lambda t: t and text in t)
+
+
+def step_child(element, tag):
+    return element.find(tag)
+
+
+STEPS = {
+    'sibling': step_sibling,
+    'next': step_next,
+    'p_block': step_p_block,
+    'string_p': step_string_p,
+    'child': step_child,
+}
+
+
+# ---------------------- Compilation ----------------------
+
+def compile_node(node, anchors, limits, path):
+    """Compiles one schema node into a function (anchor index -> (present, value))."""
+    kind = node['kind']
+    node_path = path + [node['key']]
+
+    if kind == 'field':
+        anchors.add(node['anchor'])
+        if node['max_length']:
+            limits.append((node_path, node['max_length']))
+        steps = [(STEPS[step[0]], step[1:]) for step in node['steps']]
+        read = VALUE_READERS[node['value']]
+        default = VALUE_DEFAULTS[node['value']]
+        anchor = node['anchor']
+
+        def extract_field(index):
+            element = index.get(anchor)
+            for step, args in steps:
+                if element is None:
+                    break
+                element = step(element, *args)
+            return True, read(element) if element is not None else default()
+        return extract_field
+
+    if kind == 'group':
+        children = [(child['key'], compile_node(child, anchors, limits, node_path)) for child in node['children']]
+        gate, if_missing = node['gate'], node['if_missing']
+        if gate:
+            anchors.add(gate)
+
+        def extract_group(index):
+            if gate and gate not in index:
+                return (False, None) if if_missing == 'omit' else (True, {})
+            data = {}
+            for key, extract_child in children:
+                present, value = extract_child(index)
+                if present:
+                    data[key] = value
+            return True, data
+        return extract_group
+
+    if kind == 'rows':
+        gate, container, columns = node['gate'], node['container'], node['columns']
+        anchors.update([gate, container])
+
+        def extract_rows(index):
+            data = []
+            if gate in index and container in index:
+                for row in index[container].find_all('div', class_='row'):
+                    row_data = {}
+                    for key, css_class in columns:
+                        textarea = row.find('textarea', class_=css_class)
+                        row_data[key] = textarea.get_text(strip=True) if textarea else ''
+                    data.append(row_data)
+            return True, data
+        return extract_rows
+
+    if kind == 'label_sequence':
+        gate, labels = node['gate'], node['labels']
+        anchors.add(gate)
+
+        def extract_sequence(index):
+            data = {}
+            if gate not in index:
+                return True, data
+            # Each label is searched for among the siblings after the previously found one
+            current_context = index[gate]
+            for expected_label, key, value in labels:
+                found_label = current_context.find_next_sibling('label', string=expected_label)
+                if found_label:
+                    textarea = found_label.find_next_sibling('textarea')
+                    data[key] = VALUE_READERS[value](textarea) if textarea else ""
+                    current_context = found_label
+                else:
+                    data[key] = ""
+            return True, data
+        return extract_sequence
+
+    raise ValueError(f"Unknown schema node kind '{kind}' at {'.'.join(node_path)}")
+
+
+def compile_schema(schema):
+    """
+    Compiles a schema into an extraction plan: the set of anchors to index, the
+    compiled top-level extractors and the length limits used for validation.
+    """
+    anchors, limits = set(), []
+    extractors = [(node['key'], compile_node(node, anchors, limits, [])) for node in schema]
+    wanted = {}
+    for anchor_kind, text in anchors:
+        wanted.setdefault(anchor_kind, set()).add(text)
+    return {'anchors': anchors, 'wanted': wanted, 'extractors': extractors, 'limits': limits}
+
+
+def build_anchor_index(plan, soup):
+    """
+    Walks the parsed document once and records the first element for every anchor
+    the plan needs, matching what soup.find() would return.
+    """
+    wanted = plan['wanted']
+    wanted_labels = wanted.get('label', set())
+    wanted_headings = wanted.get('h2', set())
+    wanted_ids = wanted.get('id', set())
+    wanted_placeholders = wanted.get('placeholder', set())
+    wanted_strings = wanted.get('string', set())
+    index = {}
+    for element in soup.descendants:
+        if isinstance(element, Tag):
+            if element.name in ('label', 'h2') and element.string is not None:
+                text = str(element.string)
+                if text in (wanted_labels if element.name == 'label' else wanted_headings):
+                    index.setdefault((element.name, text), element)
+            if element.name == 'textarea' and element.get('placeholder') in wanted_placeholders:
+                index.setdefault(('placeholder', element['placeholder']), element)
+            if element.get('id') in wanted_ids:
+                index.setdefault(('id', element['id']), element)
+        elif isinstance(element, NavigableString) and element.strip() in wanted_strings:
+            # Text anchors are matched ignoring surrounding whitespace ("\nNumber of series:")
+            index.setdefault(('string', element.strip()), element)
+    return index
+
+
+def extract_with_plan(plan, soup):
+    """Extracts one questionnaire record from a parsed form. Returns (record, anchor index)."""
+    index = build_anchor_index(plan, soup)
+    record = {}
+    for key, extract_node in plan['extractors']:
+        present, value = extract_node(index)
+        if present:
+            record[key] = value
+    return record, index
+
+
+def validate_record(plan, record, index):
+    """
+    Checks a freshly extracted record against the schema. Returns a list of warnings:
+    anchors missing from the form (usually a changed form template) and text fields
+    longer than their documented maximum.
+    """
+    warnings = []
+    for anchor_kind, text in sorted(plan['anchors'] - set(index)):
+        warnings.append(f"form has no {anchor_kind} '{text}'")
+    for path, max_length in plan['limits']:
+        value = record
+        for key in path:
+            value = value.get(key, "") if isinstance(value, dict) else ""
+        if len(value) > max_length:
+            warnings.append(f"{'.'.join(path)} is {len(value)} characters (max. {max_length})")
+    return warnings
+
+
+def excel_columns(schema, prefix=''):
+    """Returns the flattened column names (as produced by pandas.json_normalize) in schema order."""
+    columns = []
+    for node in schema:
+        name = f"{prefix}{node['key']}"
+        if node['kind'] == 'group':
+            columns.extend(excel_columns(node['children'], f"{name}."))
+        elif node['kind'] == 'label_sequence':
+            columns.extend(f"{name}.{key}" for _, key, _ in node['labels'])
+        elif node['kind'] == 'field' and node['value'] == 'address':
+            columns.extend(f"{name}.{key}" for key in ADDRESS_KEYS)
+        else:
+            columns.append(name)
+    return columns
+
+
+EXTRACTION_PLAN = compile_schema(QUESTIONNAIRE_SCHEMA)
+EXCEL_COLUMNS = excel_columns(QUESTIONNAIRE_SCHEMA)
@@ -1,7 +1,65 @@
-import subprocess
+import argparse
 
-subprocess.run(["python", "questionare_info.py"])
+import build_trace
+import exporters
+import join_data
+import pipeline
+import questionare_info
+import static_server
+import watch
 
-subprocess.run(["python", "join_data.py"])
 
-subprocess.run(["python", "generate_pages.py"])
+# ---------------------- Main Logic ----------------------
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build the Cinefila film catalogue: extract -> merge -> images -> render.")
+    parser.add_argument('command', nargs='?', default='build', choices=['build', 'watch', 'serve'],
+                        help="build once (default); watch: serve the site, rebuild on every change and reload "
+                             "open pages; serve: serve the built site with production-like compression and caching")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only re-extract changed questionnaires and re-render affected film pages")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="parallel questionnaire extraction processes (0 = one per CPU)")
+    parser.add_argument('--parser', default='auto', choices=['auto'] + questionare_info.PARSER_BACKENDS,
+                        help="HTML parser backend for questionnaires (auto = fastest installed)")
+    parser.add_argument('--export', nargs='*', choices=exporters.EXPORT_FORMATS,
+                        help="spreadsheet formats of the extracted questionnaires (default: xlsx, none when watching; "
+                             "none: --export with no format)")
+    parser.add_argument('--conflict-policy', default='sidecar', choices=join_data.CONFLICT_POLICIES,
+                        help="which value wins when an aditional_info.json field collides with an existing one")
+    parser.add_argument('--store', default='json', choices=['json', 'jsonl'],
+                        help="also keep the merged films in the append-only JSON-Lines store data/all_html_data.jsonl")
+    parser.add_argument('--optimize-images', action='store_true',
+                        help="losslessly optimise the poster and still originals in place (cached by content hash)")
+    parser.add_argument('--no-precompress', action='store_true',
+                        help="don't write the .gz/.br siblings of the served text files")
+    parser.add_argument('--report', default=build_trace.REPORT_PATH,
+                        help="where to write the build report (stage timings, counters, slowest films)")
+    parser.add_argument('--trace', metavar='PATH',
+                        help="also export a Chrome trace (chrome://tracing or ui.perfetto.dev) to PATH")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="record the tracemalloc peak of every stage (slows the build down)")
+    parser.add_argument('--host', default=watch.HOST, help="watch/serve: address the server listens on")
+    parser.add_argument('--port', type=int, default=watch.PORT, help="watch/serve: port of the server")
+    args = parser.parse_args()
+
+    if args.command == 'watch':
+        # always incremental and without precompression; no spreadsheets unless asked for
+        watch.watch(args.host, args.port, jobs=args.jobs, html_parser=args.parser,
+                    conflict_policy=args.conflict_policy, store=args.store,
+                    optimize_images=args.optimize_images, report_path=args.report, trace_memory=args.trace_memory,
+                    exports=args.export or [])
+    elif args.command == 'serve':
+        static_server.run('.', args.host, args.port)
+    else:
+        pipeline.build(incremental=args.incremental, jobs=args.jobs, html_parser=args.parser,
+                       conflict_policy=args.conflict_policy, store=args.store,
+                       optimize_images=args.optimize_images, compress=not args.no_precompress,
+                       report_path=args.report, chrome_trace_path=args.trace, trace_memory=args.trace_memory,
+                       exports=exporters.DEFAULT_EXPORTS if args.export is None else args.export)
+
+
+# Guarded: with the "spawn" start method (Windows, macOS) every pool worker re-imports this script
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import os
+import re
+import json
+import unicodedata
+
+import build_trace
+
+# ---------------------- Configuration ----------------------
+# Inverted index for the header search overlay and the catalogue search box (js/loadPartials.js).
+# Text is folded (lower case, accents and other combining marks removed), so "krave" finds
+# "O krávě"; the browser folds queries with the same rules (foldText in js/loadPartials.js).
+# The index is two parallel arrays: the sorted distinct tokens and, for each token, the sorted
+# ids (catalogue positions) of the films containing it. A prefix query is a binary search
+# for the first token with that prefix plus a scan of the following ones.
+SEARCH_INDEX_PATH = 'data/search_index.json'
+# Letters that don't decompose into base letter + mark
+EXTRA_FOLDS = str.maketrans({'ł': 'l', 'đ': 'd', 'ø': 'o', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ı': 'i'})
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+# ---------------------- Helper Functions ----------------------
+
+def fold(text):
+    """Lower-cases text and strips diacritics: 'O krávě' -> 'o krave'."""
+    decomposed = unicodedata.normalize('NFKD', (text or '').lower())
+    stripped = ''.join(c for c in decomposed if not unicodedata.category(c).startswith('M'))
+    return stripped.translate(EXTRA_FOLDS)
+
+
+def tokenize(text):
+    """Folded letter/digit runs of text."""
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+def searchable_text(film):
+    """The text of a merged film record the search looks at."""
+    fdata = film.get("Film", {})
+    return " ".join([
+        fdata.get("Title_English") or "",
+        fdata.get("Title_Original") or "",
+        film.get("Crew", {}).get("Director(s)") or "",
+        film.get("Logline") or "",
+        film.get("Synopsis") or "",
+        fdata.get("Keywords") or "",
+    ])
+
+
+def js_sort_key(token):
+    """Sorts like JavaScript string comparison (UTF-16 code units), which the browser's binary search relies on."""
+    return token.encode('utf-16-be')
+
+
+def build_search_index(films):
+    """Returns {'tokens': [...], 'postings': [[film id, ...], ...]}; film ids are positions in films."""
+    postings = {}
+    for film_id, film in enumerate(films):
+        for token in set(tokenize(searchable_text(film))):
+            postings.setdefault(token, []).append(film_id)
+    tokens = sorted(postings, key=js_sort_key)
+    return {'tokens': tokens, 'postings': [postings[token] for token in tokens]}
+
+
+def save_search_index(index, path=SEARCH_INDEX_PATH):
+    """Writes the search index as minified JSON."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    build_trace.file_written(path)
+    print(f"✅ Search index saved as {path} ({len(index['tokens'])} tokens)")
@@ -0,0 +1,49 @@
+import os
+import re
+import hashlib
+
+# ---------------------- Configuration ----------------------
+# Shared CSS/JS are published under content-hashed names (e.g. film_page.3f2a9c1b0e.css).
+# A changed file gets a new name, so a server may cache fingerprinted assets forever
+# (Cache-Control: public, max-age=31536000, immutable) and pages never see stale ones.
+HASH_LENGTH = 10
+
+
+# ---------------------- Helper Functions ----------------------
+
+def fingerprinted_name(filename, digest):
+    """Returns 'name.<hash>.ext' for filename 'name.ext'."""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def is_fingerprinted(filename):
+    """True if filename looks like 'name.<hash>.ext' as produced by fingerprinted_name."""
+    return re.search(rf'\.[0-9a-f]{{{HASH_LENGTH}}}\.\w+$', filename) is not None
+
+
+def publish_asset(source_path, output_dir):
+    """
+    Copies source_path into output_dir under its fingerprinted name and removes older
+    fingerprinted copies of the same file. An asset that is already published is not rewritten.
+    Returns the fingerprinted filename.
+    """
+    with open(source_path, 'rb') as f:
+        content = f.read()
+    filename = os.path.basename(source_path)
+    published = fingerprinted_name(filename, hashlib.sha256(content).hexdigest())
+
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, published)
+    if not os.path.exists(output_path):
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, output_path)
+
+    stem, ext = os.path.splitext(filename)
+    for existing in os.listdir(output_dir):
+        if (existing != published and existing.startswith(f"{stem}.") and existing.endswith(ext)
+                and is_fingerprinted(existing)):
+            os.remove(os.path.join(output_dir, existing))
+    return published
@@ -0,0 +1,384 @@
+import os
+import sys
+import time
+import asyncio
+import hashlib
+import argparse
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import unquote, urlsplit
+
+import precompress
+import static_assets
+
+# ---------------------- Configuration ----------------------
+# Local stand-in for the CDN (run.py serve), so page measurements see production-like
+# responses rather than python -m http.server's: the .br/.gz siblings written by
+# precompress.py are served to clients that accept them, every response has a strong
+# ETag (a content hash) and conditional requests get 304, fingerprinted assets
+# (static_assets.py) are cached for a year as immutable, everything else is revalidated,
+# single byte ranges are supported (large stills, video), and each request is logged with
+# its latency. Standard library only (asyncio streams, HTTP/1.1 keep-alive, GET and HEAD).
+HOST = '127.0.0.1'
+PORT = 8000
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]  # in order of preference; suffixes as written by precompress.py
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'  # may be stored, but is checked with the ETag before every use
+KEEPALIVE_TIMEOUT = 15  # seconds a connection may stay idle
+HEADER_TIMEOUT = 10  # seconds a client has to send the rest of its request head (and body) once it started
+MAX_HEADER_LINES = 100
+MAX_DISCARDED_BODY = 1024 * 1024  # request bodies up to this size are read and dropped; larger ones close
+CHUNK_SIZE = 64 * 1024
+REASONS = {200: 'OK', 206: 'Partial Content', 301: 'Moved Permanently', 304: 'Not Modified',
+           400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found', 405: 'Method Not Allowed',
+           408: 'Request Timeout', 416: 'Range Not Satisfiable'}
+
+_etags = {}  # path -> ((mtime_ns, size), etag), so every file is hashed once per change
+
+
+# ---------------------- Helper Functions ----------------------
+
+def file_etag(path, stat):
+    """Strong ETag of a file: a hash of its content, cached until its mtime or size changes."""
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _etags.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:20]}"'
+    _etags[path] = (key, etag)
+    return etag
+
+
+def accepted_encodings(header):
+    """The content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = params.strip()
+        try:
+            allowed = not q.startswith('q=') or float(q[2:]) > 0
+        except ValueError:
+            allowed = False
+        if coding and allowed:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_variant(path, stat, accept_encoding):
+    """
+    (path, stat, coding) of the representation to send: the preferred precompressed sibling
+    the client accepts if it is up to date with the file, otherwise the file itself (coding None).
+    """
+    if not path.endswith(precompress.TEXT_EXTENSIONS):
+        return path, stat, None
+    accepted = accepted_encodings(accept_encoding)
+    for coding, suffix in ENCODINGS:
+        if coding in accepted or '*' in accepted:
+            try:
+                variant_stat = os.stat(path + suffix)
+            except FileNotFoundError:
+                continue
+            if variant_stat.st_mtime_ns >= stat.st_mtime_ns:
+                return path + suffix, variant_stat, coding
+    return path, stat, None
+
+
+def etag_matches(header, etag):
+    return header.strip() == '*' or etag in (tag.strip() for tag in header.split(','))
+
+
+def not_modified(headers, etag, mtime):
+    """True if the request's validators (If-None-Match, else If-Modified-Since) still match."""
+    if 'if-none-match' in headers:
+        return etag_matches(headers['if-none-match'], etag)
+    if 'if-modified-since' in headers:
+        try:
+            return int(mtime) <= parsedate_to_datetime(headers['if-modified-since']).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_range(header, size):
+    """
+    (start, end) of a single 'bytes=' range, inclusive; None if the header is to be ignored
+    (multiple ranges or other units, answered with the whole file); 'unsatisfiable' if no byte is in it.
+    """
+    unit, _, spec = header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if not first:  # suffix range: the last n bytes
+            length = int(last)
+            return (max(size - length, 0), size - 1) if length > 0 and size else 'unsatisfiable'
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return 'unsatisfiable'
+    return start, end
+
+
+def resolve_path(root, target):
+    """
+    Filesystem path of a request target inside root, or None if it escapes root.
+    Raises ValueError for targets no file can have (e.g. an encoded null byte).
+    """
+    path = unquote(urlsplit(target).path)
+    if '\0' in path:
+        raise ValueError("Null byte in request path")
+    full = os.path.realpath(os.path.join(root, path.lstrip('/')))
+    if full != root and not full.startswith(root + os.sep):
+        return None
+    return full
+
+
+async def read_headers(reader):
+    """The header fields of a request, names lower-cased."""
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        header = (await reader.readline()).decode('latin-1')
+        if header in ('\r\n', '\n', ''):
+            return headers
+        name, _, value = header.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    raise ValueError("Too many header lines")
+
+
+async def read_request(reader):
+    """
+    (method, target, version, headers) of the next request, or None when the client is done.
+    Raises ValueError for a malformed request and asyncio.TimeoutError for one that stalls.
+    """
+    try:
+        line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+    except (asyncio.TimeoutError, ConnectionError):
+        return None
+    if not line.strip():
+        return None
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3:
+        raise ValueError(f"Malformed request line: {line!r}")
+    headers = await asyncio.wait_for(read_headers(reader), HEADER_TIMEOUT)
+    return parts[0], parts[1], parts[2], headers
+
+
+async def discard_body(reader, headers):
+    """
+    Reads and drops the request body, so the next request on the connection starts in the right place.
+    Returns False if the connection can't be reused: a chunked or oversized body, or a bad Content-Length.
+    """
+    if 'transfer-encoding' in headers:
+        return False
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        return False
+    if length < 0 or length > MAX_DISCARDED_BODY:
+        return False
+    if length:
+        await asyncio.wait_for(reader.readexactly(length), HEADER_TIMEOUT)
+    return True
+
+
+def write_head(writer, version, status, headers):
+    lines = [f"{version} {status} {REASONS[status]}", f"Date: {formatdate(usegmt=True)}", "Server: CinefilaStatic"]
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+
+
+async def send_error(writer, version, status, keep_alive, extra_headers=None):
+    body = f"{status} {REASONS[status]}\n".encode('utf-8')
+    write_head(writer, version, status, {'Content-Type': 'text/plain; charset=utf-8',
+                                         'Content-Length': len(body),
+                                         'Connection': 'keep-alive' if keep_alive else 'close',
+                                         **(extra_headers or {})})
+    writer.write(body)
+    await writer.drain()
+    return status, len(body), None
+
+
+async def send_file(writer, path, offset, count):
+    """Sends count bytes of path from offset (sendfile where the platform supports it)."""
+    loop = asyncio.get_running_loop()
+    with open(path, 'rb') as f:
+        await writer.drain()
+        await loop.sendfile(writer.transport, f, offset, count)
+
+
+async def respond(writer, root, method, target, version, headers, keep_alive):
+    """Answers one request. Returns (status, body bytes, content coding) for the log."""
+    if method not in ('GET', 'HEAD'):
+        return await send_error(writer, version, 405, keep_alive, {'Allow': 'GET, HEAD'})
+    try:
+        path = resolve_path(root, target)
+    except ValueError:
+        return await send_error(writer, version, 400, keep_alive)
+    if path is None:
+        return await send_error(writer, version, 403, keep_alive)
+    if os.path.isdir(path):
+        url_path = urlsplit(target).path
+        if not url_path.endswith('/'):  # so relative links in the index page resolve
+            write_head(writer, version, 301, {'Location': url_path + '/', 'Content-Length': 0,
+                                              'Connection': 'keep-alive' if keep_alive else 'close'})
+            await writer.drain()
+            return 301, 0, None
+        path = os.path.join(path, 'index.html')
+    try:
+        stat = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return await send_error(writer, version, 404, keep_alive)
+
+    variant, variant_stat, coding = choose_variant(path, stat, headers.get('accept-encoding', ''))
+    etag = file_etag(variant, variant_stat)
+    content_type, _ = mimetypes.guess_type(path)
+    content_type = content_type or 'application/octet-stream'
+    if content_type.startswith('text/') or content_type in ('application/javascript', 'application/json'):
+        content_type += '; charset=utf-8'
+    response_headers = {
+        'Content-Type': content_type,
+        'ETag': etag,
+        'Last-Modified': formatdate(stat.st_mtime, usegmt=True),
+        'Cache-Control': IMMUTABLE_CACHE if static_assets.is_fingerprinted(path) else REVALIDATE_CACHE,
+        'Accept-Ranges': 'bytes',
+        'Connection': 'keep-alive' if keep_alive else 'close',
+    }
+    if path.endswith(precompress.TEXT_EXTENSIONS):
+        response_headers['Vary'] = 'Accept-Encoding'
+    if coding:
+        response_headers['Content-Encoding'] = coding
+
+    if not_modified(headers, etag, stat.st_mtime):
+        write_head(writer, version, 304, response_headers)
+        await writer.drain()
+        return 304, 0, coding
+
+    size = variant_stat.st_size
+    status, start, end = 200, 0, size - 1
+    byte_range = headers.get('range')
+    if byte_range and 'if-range' in headers and headers['if-range'] != etag:
+        byte_range = None  # the client's partial copy is stale: send everything
+    if byte_range:
+        byte_range = parse_range(byte_range, size)
+        if byte_range == 'unsatisfiable':
+            return await send_error(writer, version, 416, keep_alive, {'Content-Range': f"bytes */{size}"})
+        if byte_range:
+            status, (start, end) = 206, byte_range
+            response_headers['Content-Range'] = f"bytes {start}-{end}/{size}"
+    length = end - start + 1 if size else 0
+    response_headers['Content-Length'] = length
+    write_head(writer, version, status, response_headers)
+    if method == 'GET' and length:
+        await send_file(writer, variant, start, length)
+    await writer.drain()
+    return status, length if method == 'GET' else 0, coding
+
+
+def log_request(peer, method, target, status, length, coding, seconds):
+    print(f"{peer} {method} {target} {status} {length}B"
+          f"{f' {coding}' if coding else ''} {seconds * 1000:.1f} ms", flush=True)
+
+
+async def handle_connection(reader, writer, root):
+    peer = (writer.get_extra_info('peername') or ('-',))[0]
+    try:
+        while True:
+            try:
+                request = await read_request(reader)
+            except ValueError:
+                await send_error(writer, 'HTTP/1.1', 400, False)
+                break
+            except asyncio.TimeoutError:
+                await send_error(writer, 'HTTP/1.1', 408, False)
+                break
+            if request is None:
+                break
+            start = time.perf_counter()
+            method, target, version, headers = request
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+            try:
+                keep_alive = await discard_body(reader, headers) and keep_alive
+            except (asyncio.TimeoutError, asyncio.IncompleteReadError):
+                break
+            status, length, coding = await respond(writer, root, method, target, version, headers, keep_alive)
+            log_request(peer, method, target, status, length, coding, time.perf_counter() - start)
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def self_check():
+    """
+    Checks connection handling on an ephemeral port: a POST with a body followed by a GET on
+    the same keep-alive connection, and a client that stalls in its headers. Returns True if all pass.
+    """
+    global HEADER_TIMEOUT
+    header_timeout, HEADER_TIMEOUT = HEADER_TIMEOUT, 0.5
+    server = await asyncio.start_server(lambda r, w: handle_connection(r, w, os.path.realpath('.')), HOST, 0)
+    port = server.sockets[0].getsockname()[1]
+    results = {}
+    try:
+        reader, writer = await asyncio.open_connection(HOST, port)
+        writer.write(b"POST / HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello"
+                     b"HEAD /index.html HTTP/1.1\r\nHost: x\r\n\r\n")
+        await writer.drain()
+        first = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 5)
+        await reader.readexactly(int(first.split(b'Content-Length: ')[1].split(b'\r\n')[0]))
+        second = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 5)
+        results['POST body discarded, next request answered'] = (first.startswith(b'HTTP/1.1 405')
+                                                                  and second.startswith(b'HTTP/1.1 200'))
+        writer.close()
+
+        reader, writer = await asyncio.open_connection(HOST, port)
+        writer.write(b"GET / HTTP/1.1\r\nHost: x\r\n")  # never finishes its headers
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), 5)
+        results['stalled headers time out'] = response.startswith(b'HTTP/1.1 408')
+        writer.close()
+    finally:
+        HEADER_TIMEOUT = header_timeout
+        server.close()
+        await server.wait_closed()
+    for name, passed in results.items():
+        print(f"{'OK' if passed else 'FAILED'} {name}")
+    return all(results.values())
+
+
+async def serve(root='.', host=HOST, port=PORT):
+    """Serves root until cancelled."""
+    root = os.path.realpath(root)
+    server = await asyncio.start_server(lambda r, w: handle_connection(r, w, root), host, port)
+    print(f"Serving {root} at http://{host}:{port}/ (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+
+def run(root='.', host=HOST, port=PORT):
+    try:
+        asyncio.run(serve(root, host, port))
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+
+
+# ---------------------- Main Logic ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the generated site like the CDN does.")
+    parser.add_argument('--root', default='.', help="site folder to serve")
+    parser.add_argument('--host', default=HOST, help="address to listen on")
+    parser.add_argument('--port', type=int, default=PORT, help="port to listen on")
+    parser.add_argument('--self-check', action='store_true',
+                        help="check keep-alive and timeout handling on a free port, then exit")
+    args = parser.parse_args()
+    if args.self_check:
+        sys.exit(0 if asyncio.run(self_check()) else 1)
+    run(args.root, args.host, args.port)
@@ -0,0 +1,219 @@
+import os
+import sys
+import copy
+import json
+import random
+import shutil
+import argparse
+
+from bs4 import BeautifulSoup
+
+import asset_index
+import generate_pages
+import join_data
+import questionare_info
+
+try:
+    from PIL import Image, ImageDraw
+except ImportError:  # without Pillow the corpus has no images (pages fall back to the default poster)
+    Image = None
+
+# ---------------------- Configuration ----------------------
+# Synthetic catalogues of any size for benchmark.py. Every questionnaire is one of the real
+# forms in questionare/ with its titles, dates, festival/premiere/award rows, crew and cast
+# rewritten, so it has exactly the structure extract_cinefila_info() parses; the corpus
+# also gets matching data/aditional_info.json rows, placeholder posters and stills, and
+# copies of the top-level pages and partials the build fills in.
+TEMPLATE_DIR = 'questionare'
+SITE_FILES = ['index.html', 'catalogue.html', 'news.html', 'includes/header.html', 'includes/footer.html']
+ROW_CONTAINERS = {  # container id -> maximum number of rows
+    'premiere-container': 2,
+    'festival-container': 15,
+    'awards-container': 6,
+}
+CREW_LABELS = ["Director(s):", "Screenplay writer(s):", "Director(s) of Photography:", "Editor(s):",
+               "Sound director(s):", "Art director(s):", "Music composer(s):"]
+CAST_LABEL = "Cast (actor's name: role):"
+MAX_CAST = 8
+MAX_STILLS = 4
+IMAGE_SIZE = (320, 180)
+
+FIRST_NAMES = ['Anna', 'Tomáš', 'Petra', 'Jakub', 'Eliška', 'Martin', 'Zuzana', 'Ondřej', 'Lucía', 'Mateo',
+               'Sofia', 'Jonas', 'Marta', 'Pavel', 'Ivana', 'Lukas', 'Agnieszka', 'Dávid', 'Hana', 'Filip']
+LAST_NAMES = ['Nováková', 'Dvořák', 'Horváth', 'Kowalski', 'Fernández', 'Schmidt', 'Procházka', 'Černá',
+              'Müller', 'Kovač', 'Svoboda', 'Marčetić', 'Rossi', 'Nagy', 'Baštanová', 'Jensen']
+COUNTRIES = ['Czech Republic', 'Slovakia', 'Germany', 'Poland', 'Argentina', 'France', 'Portugal',
+             'Slovenia', 'Croatia', 'Austria', 'Hungary', 'Italy', 'Spain', 'Canada', 'Japan']
+FESTIVALS = ['Anifilm', 'Cinanima', 'Annecy International Animation Film Festival', 'Animateka',
+             'Zlin Film Festival', 'Fest Anča', 'Pilsen Film Festival', 'Anima Brussels', 'Ottawa Animation Festival',
+             'Tricky Women', 'Kaboom Animation Festival', 'Festival of Nations', 'Ji.hlava', 'One World']
+AWARD_SECTIONS = ['Best Short Film', 'Audience Award', 'Special Mention', 'Best Student Film', 'Grand Prix']
+WORDS = ['cow', 'village', 'winter', 'memory', 'river', 'mother', 'war', 'home', 'friendship', 'forest',
+         'journey', 'silence', 'city', 'childhood', 'sea', 'loss', 'machine', 'dream', 'border', 'light']
+TITLE_WORDS = ['The', 'Last', 'Quiet', 'Red', 'Long', 'Small', 'Night', 'Waves', 'Garden', 'Shadow',
+               'Return', 'Beetroot', 'Patrol', 'Hedgehog', 'Soul', 'Snow', 'Glass', 'Paper']
+
+
+# ---------------------- Helper Functions ----------------------
+
+def person(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def sentence(rng, max_length):
+    """A random sentence of at most max_length characters."""
+    words = [rng.choice(WORDS) for _ in range(rng.randint(6, 40))]
+    text = f"A story about {' '.join(words)}."
+    return text if len(text) <= max_length else text[:max_length - 1].rsplit(' ', 1)[0] + '.'
+
+
+def labelled(soup, text):
+    """The <label> whose stripped text is text."""
+    return soup.find(lambda tag: tag.name == 'label' and tag.get_text(strip=True) == text)
+
+
+def textarea_after(soup, label_text, n=0):
+    return labelled(soup, label_text).find_next_siblings('textarea')[n]
+
+
+def textarea_after_h2(soup, heading):
+    return soup.find(lambda tag: tag.name == 'h2' and tag.get_text(strip=True) == heading).find_next_sibling('textarea')
+
+
+def fill_rows(soup, container_id, values):
+    """Replaces the rows of a row container; each value is a (date, country, festival) triple."""
+    container = soup.find(id=container_id)
+    rows = container.find_all('div', class_='row', recursive=False)
+    template = rows[0]
+    for row in rows:
+        row.extract()
+    for triple in values or [('', '', '')]:  # the form always keeps one (empty) row
+        row = copy.copy(template)
+        for css_class, value in zip(['date', 'country', 'festival'], triple):
+            row.find('textarea', class_=css_class).string = value
+        container.append(row)
+
+
+def synthesize_questionnaire(template_html, title_original, title_english, rng, html_parser):
+    """Returns the HTML of one synthetic questionnaire built on a real one."""
+    soup = BeautifulSoup(template_html, html_parser)
+    textarea_after(soup, 'Title', 0).string = title_original
+    textarea_after(soup, 'Title', 1).string = title_english
+    textarea_after(soup, 'Country of production').string = rng.choice(COUNTRIES)
+    year = rng.randint(2015, 2025)
+    textarea_after(soup, 'Date of completion').string = f"{rng.randint(1, 28):02}.{rng.randint(1, 12):02}.{year}"
+    textarea_after(soup, 'Runtime (for the series average value)').string = (
+        f"00:{rng.randint(2, 95):02}:{rng.randint(0, 59):02}")
+    textarea_after(soup, 'Keywords (story topics)').string = ', '.join(rng.sample(WORDS, rng.randint(1, 5)))
+
+    fill_rows(soup, 'premiere-container',
+              [(str(year), rng.choice(COUNTRIES), f"{rng.choice(FESTIVALS)} (world premiere)")
+               for _ in range(rng.randint(0, ROW_CONTAINERS['premiere-container']))])
+    fill_rows(soup, 'festival-container',
+              [(f"{rng.randint(1, 12):02}.{year}", rng.choice(COUNTRIES), rng.choice(FESTIVALS))
+               for _ in range(rng.randint(0, ROW_CONTAINERS['festival-container']))])
+    fill_rows(soup, 'awards-container',
+              [(str(year), rng.choice(COUNTRIES), f"{rng.choice(FESTIVALS)}, {rng.choice(AWARD_SECTIONS)}")
+               for _ in range(rng.randint(0, ROW_CONTAINERS['awards-container']))])
+
+    textarea_after_h2(soup, '5. Logline (max. 150 characters)').string = sentence(rng, 150)
+    textarea_after_h2(soup, '6. Synopsis (max. 350 characters)').string = sentence(rng, 350)
+    for label in CREW_LABELS:
+        textarea_after(soup, label).string = ', '.join(person(rng) for _ in range(rng.randint(0, 2)))
+    textarea_after(soup, CAST_LABEL).string = '\n'.join(
+        f"{person(rng)}: {rng.choice(WORDS)}" for _ in range(rng.randint(0, MAX_CAST)))
+    return str(soup)
+
+
+def aditional_info_row(title_original, title_english, ranking, rng):
+    """A data/aditional_info.json entry for a synthetic film."""
+    reviewer = person(rng)
+    return {
+        "Film": {"Title_Original": title_original, "Title_English": title_english},
+        "Ranking": str(ranking),
+        **{key: reviewer for key in ["Review", "Festival_Distribution_Only", "Sales", "Status",
+                                     "Download_poster", "Download_stills", "Download_presskit", "Sharing"]},
+        "Trailer_url": rng.choice(["", "https://vimeo.com/1031297187?p=0s"]),
+    }
+
+
+def write_placeholder_image(path, rng):
+    """A small JPEG with a random colour and shape (distinct content, so no cache sees duplicates)."""
+    image = Image.new('RGB', IMAGE_SIZE, tuple(rng.randrange(256) for _ in range(3)))
+    x, y = rng.randrange(IMAGE_SIZE[0]), rng.randrange(IMAGE_SIZE[1])
+    ImageDraw.Draw(image).ellipse((x - 40, y - 40, x + 40, y + 40), fill=tuple(rng.randrange(256) for _ in range(3)))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    image.save(path, quality=85)
+
+
+def write_images(slug, rng):
+    """Poster and one to MAX_STILLS stills in the folders asset_index scans."""
+    write_placeholder_image(os.path.join(asset_index.POSTERS_DIR, slug, f"{slug}.jpg"), rng)
+    for i in range(1, rng.randint(1, MAX_STILLS) + 1):
+        write_placeholder_image(os.path.join(asset_index.STILLS_DIR, slug, f"{slug}_{i}.jpg"), rng)
+
+
+def copy_site_files(source_dir, output_dir):
+    for name in SITE_FILES:
+        source = os.path.join(source_dir, name)
+        if os.path.exists(source):
+            os.makedirs(os.path.dirname(os.path.join(output_dir, name)) or output_dir, exist_ok=True)
+            shutil.copyfile(source, os.path.join(output_dir, name))
+
+
+def generate_corpus(output_dir, films, seed=0, template_dir=TEMPLATE_DIR, html_parser='auto', images=True):
+    """
+    Writes a synthetic catalogue of films questionnaires into output_dir (questionare/,
+    data/aditional_info.json, images/ and the site pages), reproducibly for a given seed.
+    Without images, no posters or stills are written.
+    """
+    images = images and Image is not None
+    rng = random.Random(seed)
+    html_parser = questionare_info.resolve_parser(html_parser)
+    source_dir = os.path.abspath(os.path.dirname(template_dir) or '.')
+    template_dir = os.path.abspath(template_dir)
+    templates = []
+    for filename in sorted(os.listdir(template_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(template_dir, filename), 'r', encoding='utf-8') as f:
+                templates.append(f.read())
+
+    os.makedirs(output_dir, exist_ok=True)
+    copy_site_files(source_dir, output_dir)
+    cwd = os.getcwd()
+    os.chdir(output_dir)  # asset_index and join_data paths are relative to the site root
+    try:
+        os.makedirs('questionare', exist_ok=True)
+        aditional_info = []
+        for i in range(films):
+            title_english = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)} {i + 1}"
+            title_original = f"{title_english} ({rng.choice(['cz', 'sk', 'pl', 'de'])})"
+            html = synthesize_questionnaire(templates[i % len(templates)], title_original, title_english, rng,
+                                            html_parser)
+            slug = generate_pages.sanitize_filename(title_english)
+            with open(os.path.join('questionare', f"{slug}.html"), 'w', encoding='utf-8') as f:
+                f.write(html)
+            aditional_info.append(aditional_info_row(title_original, title_english, rng.randint(1, films), rng))
+            if images:
+                write_images(slug, random.Random(f"{seed}:{slug}"))  # own generator: same texts with or without images
+        os.makedirs(os.path.dirname(join_data.ADITIONAL_INFO_PATH), exist_ok=True)
+        with open(join_data.ADITIONAL_INFO_PATH, 'w', encoding='utf-8') as f:
+            json.dump(aditional_info, f, ensure_ascii=False, indent=2)
+    finally:
+        os.chdir(cwd)
+    print(f"✅ Synthetic corpus of {films} film(s) written to {output_dir}"
+          f"{'' if Image is not None else ' ⚠️ Pillow not installed: no images'}")
+
+
+# ---------------------- Main Logic ----------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic Cinefila catalogue for benchmarking.")
+    parser.add_argument('output_dir', help="folder to write the corpus into")
+    parser.add_argument('--films', type=int, default=200, help="number of films")
+    parser.add_argument('--seed', type=int, default=0, help="random seed (same seed, same corpus)")
+    parser.add_argument('--no-images', action='store_true', help="don't write posters and stills")
+    args = parser.parse_args()
+    if os.path.exists(os.path.join(args.output_dir, 'questionare')):
+        print(f"Error: {args.output_dir} already contains a corpus.")
+        sys.exit(1)
+    generate_corpus(args.output_dir, args.films, args.seed, images=not args.no_images)
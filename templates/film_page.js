@@ -0,0 +1,109 @@
+document.addEventListener('DOMContentLoaded', function() {
+  // Stills Lightbox
+  const stillsLightbox = document.getElementById('lightbox');
+  const stillsLightboxImg = document.getElementById('lightbox-img');
+  const stillsCloseBtn = stillsLightbox.querySelector('.close-btn');
+  const stillsPrevBtn = stillsLightbox.querySelector('.prev-btn');
+  const stillsNextBtn = stillsLightbox.querySelector('.next-btn');
+
+  let currentStillIndex = 0;
+  let currentStills = [];
+
+  // TARGET THE MAIN STILL IMAGE FOR CLICK EVENT
+  const mainFilmStill = document.getElementById('main-film-still');
+  if (mainFilmStill) {
+    // Initialize currentStills from the data-stills attribute of the main still
+    currentStills = JSON.parse(mainFilmStill.dataset.stills);
+    mainFilmStill.addEventListener('click', function() {
+      const clickedStill = this.getAttribute('src');
+      currentStillIndex = currentStills.indexOf(clickedStill); // Should be 0 for the first still
+      showStill(currentStillIndex);
+      stillsLightbox.style.display = 'flex';
+    });
+  }
+
+  // Fallback/alternative for if main still isn't present but other stills exist
+  // This is less likely if main_still_html is always generated from all_stills[0]
+  document.querySelectorAll('.stills-gallery img').forEach(img => {
+    img.addEventListener('click', function() {
+      currentStills = JSON.parse(this.dataset.stills);
+      const clickedStill = this.getAttribute('src');
+      currentStillIndex = currentStills.indexOf(clickedStill);
+      showStill(currentStillIndex);
+      stillsLightbox.style.display = 'flex';
+    });
+  });
+
+
+  stillsCloseBtn.addEventListener('click', function() {
+    stillsLightbox.style.display = 'none';
+  });
+
+  stillsLightbox.addEventListener('click', function(e) {
+    if (e.target === stillsLightbox) {
+      stillsLightbox.style.display = 'none';
+    }
+  });
+
+  stillsPrevBtn.addEventListener('click', function() {
+    currentStillIndex = (currentStillIndex - 1 + currentStills.length) % currentStills.length;
+    showStill(currentStillIndex);
+  });
+
+  stillsNextBtn.addEventListener('click', function() {
+    currentStillIndex = (currentStillIndex + 1) % currentStills.length;
+    showStill(currentStillIndex);
+  });
+
+  function showStill(index) {
+    if (currentStills.length > 0) {
+      stillsLightboxImg.src = currentStills[index];
+    }
+  }
+
+  // Poster Lightbox
+  const posterLightbox = document.getElementById('poster-lightbox');
+  const posterLightboxImg = document.getElementById('poster-lightbox-img');
+  const posterCloseBtn = posterLightbox.querySelector('.close-btn');
+  const filmPoster = document.getElementById('poster-img');
+
+  if (filmPoster) {
+    filmPoster.addEventListener('click', function() {
+      posterLightboxImg.src = this.src;
+      posterLightbox.style.display = 'flex';
+    });
+  }
+
+  posterCloseBtn.addEventListener('click', function() {
+    posterLightbox.style.display = 'none';
+  });
+
+  posterLightbox.addEventListener('click', function(e) {
+    if (e.target === posterLightbox) {
+      posterLightbox.style.display = 'none';
+    }
+  });
+
+  // Global Keydown for closing any lightbox
+  document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') {
+      if (stillsLightbox.style.display === 'flex') {
+        stillsCloseBtn.click();
+      }
+      if (posterLightbox.style.display === 'flex') {
+        posterCloseBtn.click();
+      }
+    }
+  });
+
+  // Centralized Click-to-Close (for both stills and poster lightboxes)
+  const allLightboxes = [stillsLightbox, posterLightbox];
+  allLightboxes.forEach(lb => {
+      lb.addEventListener('click', function(e) {
+          // Check if the click is directly on the lightbox background
+          if (e.target === lb) {
+              lb.style.display = 'none';
+          }
+      });
+  });
+});
@@ -0,0 +1,183 @@
+import os
+import time
+import threading
+import traceback
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import image_derivatives
+import page_templates
+import pipeline
+import join_data
+import page_includes
+
+# ---------------------- Configuration ----------------------
+# Edit-and-preview loop (run.py watch): serves the site locally, polls the build inputs and,
+# when one changes, runs an incremental build. The build manifest limits that to the changed
+# questionnaires and the film pages whose inputs changed; the catalogue data is rewritten
+# from the in-memory records. Open pages then reload themselves: the dev server adds a small
+# script to every HTML page it serves that listens for build events (Server-Sent Events).
+WATCHED_PATHS = [pipeline.QUESTIONNAIRE_DIR, join_data.ADITIONAL_INFO_PATH, 'images',
+                 page_templates.TEMPLATE_DIR, page_includes.INCLUDES_DIR]
+IGNORED_DIRS = {os.path.normpath(image_derivatives.DERIVED_DIR)}  # written by the build itself
+POLL_INTERVAL = 0.3  # seconds
+SETTLE_TIME = 0.2  # seconds without further changes before rebuilding (editors save in several steps)
+HOST = '127.0.0.1'
+PORT = 8000
+EVENTS_PATH = '/__build_events'
+RELOAD_SCRIPT = (f"<script>new EventSource('{EVENTS_PATH}')"
+                 f".addEventListener('build', () => location.reload());</script>")
+
+
+# ---------------------- Helper Functions ----------------------
+
+def snapshot(paths=WATCHED_PATHS):
+    """{path: (mtime_ns, size)} of every file under the watched paths."""
+    files = {}
+    for root in paths:
+        if os.path.isfile(root):
+            st = os.stat(root)
+            files[root] = (st.st_mtime_ns, st.st_size)
+            continue
+        for folder, dirs, names in os.walk(root):
+            dirs[:] = [d for d in dirs if os.path.normpath(os.path.join(folder, d)) not in IGNORED_DIRS]
+            for name in names:
+                path = os.path.join(folder, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:  # removed while walking
+                    continue
+                files[path] = (st.st_mtime_ns, st.st_size)
+    return files
+
+
+def changed_paths(before, after):
+    return sorted(path for path in before.keys() | after.keys() if before.get(path) != after.get(path))
+
+
+class BuildEvents:
+    """Build counter the event streams wait on; every finished build wakes them all."""
+
+    def __init__(self):
+        self.build = 0
+        self.condition = threading.Condition()
+
+    def publish(self):
+        with self.condition:
+            self.build += 1
+            self.condition.notify_all()
+
+    def wait(self, seen, timeout):
+        """Waits until a build newer than seen finished (or timeout). Returns the latest build."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.build != seen, timeout)
+            return self.build
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """Static files without caching, HTML with the reload script, and the build event stream."""
+
+    events = None  # BuildEvents, set by serve()
+
+    def end_headers(self):
+        self.send_header('Cache-Control', 'no-store')
+        super().end_headers()
+
+    def do_GET(self):
+        if self.path == EVENTS_PATH:
+            return self.stream_events()
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = os.path.join(path, 'index.html')
+        if path.endswith('.html') and os.path.isfile(path):
+            return self.send_html(path)
+        return super().do_GET()
+
+    def send_html(self, path):
+        with open(path, 'rb') as f:
+            html = f.read()
+        marker = html.rfind(b'</body>')
+        script = RELOAD_SCRIPT.encode('utf-8')
+        html = html[:marker] + script + html[marker:] if marker != -1 else html + script
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(html)))
+        self.end_headers()
+        self.wfile.write(html)
+
+    def stream_events(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        seen = self.events.build
+        try:
+            while True:
+                latest = self.events.wait(seen, timeout=15)
+                # a comment line keeps the connection alive; an event tells the page to reload
+                self.wfile.write(b'event: build\ndata: reload\n\n' if latest != seen else b': ping\n\n')
+                self.wfile.flush()
+                seen = latest
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, format, *args):
+        pass  # keep the console for build output
+
+
+def serve(events, host=HOST, port=PORT, directory='.'):
+    """Starts the dev server in a background thread and returns it."""
+    handler = partial(type('Handler', (DevRequestHandler,), {'events': events}), directory=directory)
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def rebuild(build_options):
+    """One incremental build; errors are printed, the watcher keeps running. Returns True on success."""
+    start = time.perf_counter()
+    try:
+        pipeline.build(incremental=True, **build_options)
+    except Exception:
+        traceback.print_exc()
+        print("⚠️ Build failed, waiting for the next change.")
+        return False
+    print(f"✅ Rebuilt in {time.perf_counter() - start:.2f} s")
+    return True
+
+
+def watch(host=HOST, port=PORT, **build_options):
+    """
+    Serves the site and rebuilds it incrementally whenever a watched input changes, until Ctrl+C.
+    build_options are passed on to pipeline.build (spreadsheet exports and precompression
+    are off unless given, since a preview needs neither).
+    """
+    build_options = {'exports': [], 'compress': False, **build_options}
+    events = BuildEvents()
+    rebuild(build_options)
+    server = serve(events, host, port)
+    watched = ', '.join(os.path.relpath(path) for path in WATCHED_PATHS)
+    print(f"Serving http://{host}:{port}/ — watching {watched} (Ctrl+C to stop)")
+
+    state = snapshot()
+    try:
+        while True:
+            time.sleep(POLL_INTERVAL)
+            current = snapshot()
+            if current == state:
+                continue
+            while True:  # wait until the files stop changing
+                time.sleep(SETTLE_TIME)
+                settled = snapshot()
+                if settled == current:
+                    break
+                current = settled
+            changes = changed_paths(state, current)
+            print(f"\nChanged: {', '.join(changes[:5])}{f' and {len(changes) - 5} more' if len(changes) > 5 else ''}")
+            state = current
+            if rebuild(build_options):
+                events.publish()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+    finally:
+        server.shutdown()